@@ -0,0 +1,187 @@
+import asyncio
+import hashlib
+import multiprocessing
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, List, Optional
+
+from llama_index.core import Document
+from llama_index.core.node_parser import SentenceSplitter, TokenTextSplitter
+from llama_index.core.schema import BaseNode
+from agentic_rag.config import config
+
+CHUNK_STRATEGIES = ("sentence", "token", "section")
+
+_SENTENCE_END_RE = re.compile(r"[.!?:;,]\s*$")
+
+
+@dataclass(frozen=True)
+class ChunkingConfig:
+    """How documents are split into nodes.
+
+    - sentence: sentence-aware chunks of chunk_size tokens
+    - token: fixed token windows with chunk_overlap
+    - section: sentence chunks that never cross a section title
+    """
+
+    strategy: str = config.CHUNK_STRATEGY
+    chunk_size: int = config.CHUNK_SIZE
+    chunk_overlap: int = config.CHUNK_OVERLAP
+    tokenizer: str = config.TOKENIZER_ENCODING
+
+    def __post_init__(self):
+        if self.strategy not in CHUNK_STRATEGIES:
+            raise ValueError(
+                f"Unknown chunking strategy {self.strategy!r}, expected one of {CHUNK_STRATEGIES}"
+            )
+
+
+@lru_cache(maxsize=None)
+def get_tokenizer(encoding_name: str) -> Callable[[str], List[int]]:
+    """Load a tiktoken encoding once per worker process."""
+    import tiktoken
+
+    return tiktoken.get_encoding(encoding_name).encode
+
+
+@lru_cache(maxsize=None)
+def get_node_parser(chunking_config: ChunkingConfig):
+    tokenizer = get_tokenizer(chunking_config.tokenizer)
+    if chunking_config.strategy == "token":
+        return TokenTextSplitter(
+            chunk_size=chunking_config.chunk_size,
+            chunk_overlap=chunking_config.chunk_overlap,
+            tokenizer=tokenizer,
+        )
+    return SentenceSplitter(
+        chunk_size=chunking_config.chunk_size,
+        chunk_overlap=chunking_config.chunk_overlap,
+        tokenizer=tokenizer,
+    )
+
+
+def _is_title(block: str) -> bool:
+    return (
+        "\n" not in block
+        and len(block.split()) <= 12
+        and any(c.isalpha() for c in block)
+        and not _SENTENCE_END_RE.search(block)
+    )
+
+
+def split_sections(doc: Document) -> List[Document]:
+    """Split a document into sections starting at title blocks.
+
+    DocumentLoader joins UnstructuredReader elements with blank lines, so each
+    block is one layout element; short single-line blocks without sentence
+    punctuation are treated as titles.
+    """
+    sections, current, title = [], [], ""
+    for block in (b.strip() for b in doc.get_content().split("\n\n")):
+        if not block:
+            continue
+        if _is_title(block):
+            if current:
+                sections.append((title, current))
+                current = []
+            title = block
+        current.append(block)
+    if current:
+        sections.append((title, current))
+
+    return [
+        Document(
+            id_=f"{doc.doc_id}_section_{i}",
+            text="\n\n".join(blocks),
+            metadata={**doc.metadata, "section": section_title},
+            excluded_embed_metadata_keys=doc.excluded_embed_metadata_keys,
+            excluded_llm_metadata_keys=doc.excluded_llm_metadata_keys,
+        )
+        for i, (section_title, blocks) in enumerate(sections)
+    ]
+
+
+def parse_document(doc: Document, chunking_config: ChunkingConfig) -> List[BaseNode]:
+    """Chunk one document; runs in a worker process."""
+    parser = get_node_parser(chunking_config)
+    docs = split_sections(doc) if chunking_config.strategy == "section" else [doc]
+    return parser.get_nodes_from_documents(docs)
+
+
+def nodes_digest(nodes: List[BaseNode]) -> str:
+    """Digest of node texts in order, identifying one chunking of a document.
+
+    Node IDs are random per run, so persisted indexes are keyed on content.
+    """
+    digest = hashlib.sha1()
+    for node in nodes:
+        digest.update(node.get_content().encode())
+        digest.update(b"\0")
+    return digest.hexdigest()[:16]
+
+
+def deduplicate_nodes(nodes_per_doc: List[List[BaseNode]]) -> List[List[BaseNode]]:
+    """Drop nodes whose normalized text already appeared in an earlier document.
+
+    A document is left untouched if deduplication would remove all its nodes,
+    so every document still gets an index and an agent.
+    """
+    seen = set()
+    deduplicated = []
+    for nodes in nodes_per_doc:
+        digests = [
+            hashlib.sha1(" ".join(n.get_content().lower().split()).encode()).hexdigest()
+            for n in nodes
+        ]
+        kept = [node for node, digest in zip(nodes, digests) if digest not in seen]
+        seen.update(digests)
+        deduplicated.append(kept or nodes)
+    return deduplicated
+
+
+class NodeChunker:
+    """Chunks documents in worker processes so splitting never blocks the event loop.
+
+    The worker pool is created on first use and kept until aclose(), so each
+    worker's tokenizer and parser caches are reused across ingestions. Workers
+    are spawned rather than forked, since the service process already runs
+    threads.
+    """
+
+    def __init__(
+        self,
+        chunking_config: ChunkingConfig = ChunkingConfig(),
+        max_workers: int = config.CHUNK_WORKERS,
+    ):
+        self.chunking_config = chunking_config
+        self.max_workers = max_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    async def aparse(self, docs: List[Document]) -> List[List[BaseNode]]:
+        """Return the nodes of each document, in document order."""
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        return await asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    executor, parse_document, doc, self.chunking_config
+                )
+                for doc in docs
+            )
+        )
+
+    async def aclose(self) -> None:
+        """Shut the worker pool down without blocking the event loop."""
+        if self._executor is not None:
+            executor, self._executor = self._executor, None
+            await asyncio.to_thread(executor.shutdown)
@@ -6,6 +6,27 @@ class LLMConfigParams:
     DEFAULT_MODEL: str = "qwen2.5:14b-instruct-q4_K_M"
     OLLAMA_BASE_URL: str = "http://localhost:11434"
     MIROSTAT: int = 0
+    # Concurrent requests the shared LLM scheduler sends to the Ollama server
+    LLM_MAX_CONCURRENCY: int = 2
+    # Node parsing: "sentence", "token" or "section"
+    CHUNK_STRATEGY: str = "sentence"
+    CHUNK_SIZE: int = 1024
+    CHUNK_OVERLAP: int = 200
+    CHUNK_WORKERS: int = 4
+    TOKENIZER_ENCODING: str = "cl100k_base"
+    # Document routing: dispatch straight to one document agent above the
+    # direct threshold, otherwise give the top agent only the routed documents
+    ROUTER_DIRECT_THRESHOLD: float = 0.8
+    ROUTER_COVERAGE: float = 0.9
+    ROUTER_MAX_DOCUMENTS: int = 3
+    ROUTER_TEMPERATURE: float = 0.1
+    ROUTER_KEYWORD_WEIGHT: float = 0.4
+    ROUTER_ENTITY_WEIGHT: float = 0.2
+    ROUTER_EMBEDDING_WEIGHT: float = 0.4
+    # Query service
+    DOCUMENTS_DIR: str = "./documents/"
+    SERVICE_HOST: str = "127.0.0.1"
+    SERVICE_PORT: int = 8080
 
 
 # Create a singleton instance
@@ -6,7 +6,6 @@ from typing import Dict, List
 from tqdm import tqdm
 
 from llama_index.core import Document
-from llama_index.core.node_parser import SentenceSplitter
 from llama_index.core import (
     load_index_from_storage,
     StorageContext,
@@ -16,20 +15,34 @@ from llama_index.core import (
 from llama_index.core.tools import QueryEngineTool
 from llama_index.core.agent.workflow import FunctionAgent
 from agentic_rag.llm_config import LLMConfig
+from agentic_rag.chunking import (
+    ChunkingConfig,
+    NodeChunker,
+    deduplicate_nodes,
+    nodes_digest,
+)
 
 
 class DocumentAgentBuilder:
-    def __init__(self, llm_config: LLMConfig):
+    def __init__(
+        self, llm_config: LLMConfig, chunking_config: ChunkingConfig = ChunkingConfig()
+    ):
         self.llm = llm_config.llm
-        self.node_parser = SentenceSplitter()
+        self.chunker = NodeChunker(chunking_config)
 
     async def build_agent_per_doc(
         self, nodes: List, file_base: str
     ) -> tuple[FunctionAgent, str]:
-        vi_out_path = f"./data/index/{file_base}"
+        # Keyed on the nodes so a new chunking strategy or deduplication
+        # result builds a new vector index instead of reusing a stale one
+        vi_out_path = f"./data/index/{file_base}_{nodes_digest(nodes)}"
         summary_out_path = f"./data/index/{file_base}_summary.pkl"
 
-        vector_index = self._get_or_create_vector_index(nodes, vi_out_path)
+        # Embedding every node, or loading a persisted index, blocks for a
+        # while, so it runs off the event loop to keep serving queries
+        vector_index = await asyncio.to_thread(
+            self._get_or_create_vector_index, nodes, vi_out_path
+        )
         summary_index = SummaryIndex(nodes)
 
         vector_query_engine = vector_index.as_query_engine(llm=self.llm)
@@ -97,12 +110,15 @@ You must ALWAYS use at least one of the tools provided when answering a question
             summary = pickle.load(open(summary_out_path, "rb"))
         return summary
 
+    async def aclose(self) -> None:
+        await self.chunker.aclose()
+
     async def build_agents(self, docs: List[Document]) -> tuple[Dict, Dict]:
         agents_dict = {}
         extra_info_dict = {}
 
-        for idx, doc in enumerate(tqdm(docs)):
-            nodes = self.node_parser.get_nodes_from_documents([doc])
+        nodes_per_doc = deduplicate_nodes(await self.chunker.aparse(docs))
+        for doc, nodes in zip(tqdm(docs), nodes_per_doc):
             file_path = Path(doc.metadata["path"])
             file_base = str(file_path.parent.stem) + "_" + str(file_path.stem)
 
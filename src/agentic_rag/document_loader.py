@@ -1,14 +1,22 @@
 from typing import List
 from pathlib import Path
-from llama_index.readers.file import UnstructuredReader
 from llama_index.core import Document
 
 
 class DocumentLoader:
     def __init__(self, documents_dir: str = "./documents/"):
-        self.reader = UnstructuredReader()
+        self._reader = None
         self.documents_dir = documents_dir
 
+    @property
+    def reader(self):
+        # unstructured is slow to import, so only load it when documents are read
+        if self._reader is None:
+            from llama_index.readers.file import UnstructuredReader
+
+            self._reader = UnstructuredReader()
+        return self._reader
+
     def load_documents(self) -> List[Document]:
         all_files_gen = Path(self.documents_dir).rglob("*")
         all_files = [f.resolve() for f in all_files_gen]
@@ -1,15 +1,22 @@
-from llama_index.llms.ollama import Ollama
-from llama_index.embeddings.ollama import OllamaEmbedding
 from llama_index.core import Settings
+from llm_scheduler.scheduler import scheduler
 from .config import config
 
 
 class LLMConfig:
     def __init__(self, model_name: str = config.DEFAULT_MODEL):
-        self.llm = Ollama(model=model_name)
+        # The Ollama clients are imported here so importing this module stays cheap
+        from llama_index.embeddings.ollama import OllamaEmbedding
+        from llm_scheduler.scheduled_llm import ScheduledOllama
+
+        # Requests queue in the shared scheduler so concurrent sessions in this
+        # process do not overload the Ollama server
+        scheduler.set_backend_limit(config.OLLAMA_BASE_URL, config.LLM_MAX_CONCURRENCY)
+        self.llm = ScheduledOllama(model=model_name, base_url=config.OLLAMA_BASE_URL)
         Settings.llm = self.llm
-        Settings.embed_model = OllamaEmbedding(
+        self.embed_model = OllamaEmbedding(
             model_name=model_name,
             base_url=config.OLLAMA_BASE_URL,
             ollama_additional_kwargs={"mirostat": config.MIROSTAT},
         )
+        Settings.embed_model = self.embed_model
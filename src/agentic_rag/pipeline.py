@@ -0,0 +1,170 @@
+import asyncio
+import os
+import pickle
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from llama_index.core import Settings, VectorStoreIndex
+from llama_index.core.agent.workflow import ReActAgent
+from llama_index.core.objects import ObjectIndex
+from llama_index.core.tools import FunctionTool
+from agentic_rag.document_loader import DocumentLoader
+from agentic_rag.llm_config import LLMConfig
+from agentic_rag.document_agent_builder import DocumentAgentBuilder
+from agentic_rag.agent_tool_builder import AgentToolBuilder
+from agentic_rag.top_agent_builder import CustomObjectRetriever
+from agentic_rag.routing_index import DocumentRouter, RoutingDecision
+
+ROUTER_OUT_PATH = "./data/index/router.pkl"
+
+TOP_AGENT_PROMPT = """ \
+                    You are an agent designed to answer queries about the documentation.
+                    Please always use the tools provided to answer a question. Do not rely on prior knowledge.\
+
+                    """
+
+
+class NoMatchingDocumentsError(LookupError):
+    """Raised when the metadata filters of a query match no document."""
+
+
+def get_or_create_router(extra_info_dict: Dict) -> DocumentRouter:
+    """Load the persisted routing index, rebuilding it when the documents changed."""
+    fingerprint = DocumentRouter.fingerprint_for(extra_info_dict)
+    if os.path.exists(ROUTER_OUT_PATH):
+        router = pickle.load(open(ROUTER_OUT_PATH, "rb"))
+        if router.fingerprint == fingerprint:
+            return router
+
+    router = DocumentRouter.build(extra_info_dict, Settings.embed_model)
+    Path(ROUTER_OUT_PATH).parent.mkdir(parents=True, exist_ok=True)
+    pickle.dump(router, open(ROUTER_OUT_PATH, "wb"))
+    return router
+
+
+@dataclass
+class RagPipeline:
+    """Everything built at ingestion time, shared by all queries.
+
+    Agents keep their memory in the Context created for each run, so one
+    pipeline can serve concurrent queries without them seeing each other.
+    """
+
+    llm_config: LLMConfig
+    agents_dict: Dict
+    extra_info_dict: Dict
+    all_tools: List[FunctionTool]
+    obj_index: ObjectIndex
+    tool_retriever: CustomObjectRetriever
+    top_agent: ReActAgent
+    router: DocumentRouter
+    doc_agent_builder: DocumentAgentBuilder
+
+    @classmethod
+    async def build(
+        cls,
+        documents_dir: str = "./documents/",
+        doc_agent_builder: Optional[DocumentAgentBuilder] = None,
+    ) -> "RagPipeline":
+        """Ingest documents and build all agents and indexes.
+
+        Pass the previous pipeline's doc_agent_builder when reloading to reuse
+        its chunking worker pool.
+        """
+        from llama_index.postprocessor.cohere_rerank import CohereRerank
+
+        llm_config = LLMConfig()
+
+        # Load documents and create agents
+        doc_loader = DocumentLoader(documents_dir)
+        docs = await asyncio.to_thread(doc_loader.load_documents)
+
+        # Build document agents
+        doc_agent_builder = doc_agent_builder or DocumentAgentBuilder(llm_config)
+        agents_dict, extra_info_dict = await doc_agent_builder.build_agents(docs)
+
+        # Create tools from document agents
+        tool_builder = AgentToolBuilder(agents_dict, extra_info_dict)
+        all_tools = tool_builder.build_tools()
+
+        # Create object index
+        obj_index = await asyncio.to_thread(
+            ObjectIndex.from_objects,
+            all_tools,
+            index_cls=VectorStoreIndex,
+        )
+
+        # Create vector node retriever
+        vector_node_retriever = obj_index.as_node_retriever(
+            similarity_top_k=10,
+        )
+
+        # Wrap it with ObjectRetriever to return objects
+        tool_retriever = CustomObjectRetriever(
+            vector_node_retriever,
+            obj_index.object_node_mapping,
+            node_postprocessors=[CohereRerank(top_n=5, model="rerank-v3.5")],
+            llm=llm_config.llm,
+        )
+
+        # Build top agent
+        top_agent = ReActAgent(
+            tool_retriever=tool_retriever,
+            system_prompt=TOP_AGENT_PROMPT,
+            llm=llm_config.llm,
+        )
+
+        # Build document routing index
+        router = await asyncio.to_thread(get_or_create_router, extra_info_dict)
+
+        return cls(
+            llm_config=llm_config,
+            agents_dict=agents_dict,
+            extra_info_dict=extra_info_dict,
+            all_tools=all_tools,
+            obj_index=obj_index,
+            tool_retriever=tool_retriever,
+            top_agent=top_agent,
+            router=router,
+            doc_agent_builder=doc_agent_builder,
+        )
+
+    async def aclose(self) -> None:
+        await self.doc_agent_builder.aclose()
+
+    async def route(
+        self, query: str, filters: Optional[Dict] = None
+    ) -> RoutingDecision:
+        return await self.router.aroute(
+            query, self.llm_config.embed_model, filters=filters
+        )
+
+    async def run(self, query: str, filters: Optional[Dict] = None):
+        """Route a query and start it with its own agent Context.
+
+        A confident single-document route is dispatched straight to that
+        document's agent; otherwise the top agent only sees the routed
+        documents' tools, falling back to tool retrieval when nothing was routed.
+        Returns the workflow handler.
+
+        Raises NoMatchingDocumentsError when filters were given and match no
+        document, rather than ignoring them.
+        """
+        decision = await self.route(query, filters)
+        if decision.direct:
+            return self.agents_dict[decision.documents[0]].run(query)
+
+        if not decision.documents:
+            if filters:
+                raise NoMatchingDocumentsError(f"No documents match filters {filters}")
+            return self.top_agent.run(query)
+
+        tools_by_name = {tool.metadata.name: tool for tool in self.all_tools}
+        routed_tools = [tools_by_name[f"tool_{doc}"] for doc in decision.documents]
+        top_agent = ReActAgent(
+            tool_retriever=self.tool_retriever.with_tools(routed_tools),
+            system_prompt=TOP_AGENT_PROMPT,
+            llm=self.llm_config.llm,
+        )
+        return top_agent.run(query)
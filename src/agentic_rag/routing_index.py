@@ -0,0 +1,257 @@
+import math
+import re
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from agentic_rag.config import config
+from agentic_rag.chunking import nodes_digest
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+# Capitalized phrases and acronyms, e.g. "Nvidia Jetson", "GPU", "Google Cloud"
+_ENTITY_RE = re.compile(r"\b[A-Z][A-Za-z0-9&\-]*(?:[ \t]+[A-Z][A-Za-z0-9&\-]*)*\b")
+_LOWERCASE_WORD_RE = re.compile(r"\b[a-z][a-z0-9]*\b")
+# Characters after which a capitalized word starts a sentence, line or bullet
+_SENTENCE_BREAKS = ".!?:\n*#-\u2022"
+_STOPWORDS = frozenset(
+    "a about an and are as at be by do does for from has have how in is it its many "
+    "much of on or that the their this to was were what when where which who why "
+    "will with".split()
+)
+SECTION_CHARS = 2000
+# Bump when the index contents change so persisted routers are rebuilt
+ROUTER_FORMAT_VERSION = 2
+
+
+def tokenize(text: str) -> List[str]:
+    return [w for w in _WORD_RE.findall(text.lower()) if w not in _STOPWORDS]
+
+
+def _is_sentence_initial(text: str, start: int) -> bool:
+    i = start - 1
+    while i >= 0 and text[i] in " \t":
+        i -= 1
+    return i < 0 or text[i] in _SENTENCE_BREAKS
+
+
+def extract_entities(text: str, skip_sentence_initial: bool = False) -> set:
+    """Capitalized phrases and their words, lowercased.
+
+    With skip_sentence_initial, a word that is only capitalized because it
+    starts a sentence, heading or bullet is not an entity on its own.
+    """
+    entities = set()
+    for match in _ENTITY_RE.finditer(text):
+        raw_words = match.group(0).split()
+        words = [w.lower() for w in raw_words if w.lower() not in _STOPWORDS]
+        if not words:
+            continue
+        entities.add(" ".join(words))
+        if skip_sentence_initial and _is_sentence_initial(text, match.start()):
+            raw_words = raw_words[1:]
+        entities.update(w.lower() for w in raw_words if w.lower() not in _STOPWORDS)
+    return entities
+
+
+@dataclass
+class RoutingDecision:
+    """Documents selected for a query, best first, with per-document probabilities."""
+
+    documents: List[str]
+    scores: Dict[str, float]
+    confidence: float
+    direct: bool
+
+
+@dataclass
+class DocumentRouter:
+    """Document-level routing index built at ingestion time.
+
+    Combines BM25 over per-document keyword postings, entity postings and the
+    best-matching section embedding of each document, after exact-match
+    metadata filters, to pick the documents a query needs before any LLM call.
+    """
+
+    keyword_postings: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    entity_postings: Dict[str, set] = field(default_factory=dict)
+    doc_lengths: Dict[str, int] = field(default_factory=dict)
+    section_docs: List[str] = field(default_factory=list)
+    section_embeddings: Optional[np.ndarray] = None
+    metadata: Dict[str, Dict] = field(default_factory=dict)
+    fingerprint: Tuple = ()
+
+    @staticmethod
+    def fingerprint_for(extra_info_dict: Dict) -> Tuple:
+        return (ROUTER_FORMAT_VERSION,) + tuple(
+            sorted(
+                (doc, nodes_digest(info["nodes"]))
+                for doc, info in extra_info_dict.items()
+            )
+        )
+
+    @classmethod
+    def build(cls, extra_info_dict: Dict, embed_model) -> "DocumentRouter":
+        router = cls(fingerprint=cls.fingerprint_for(extra_info_dict))
+        doc_texts = {
+            doc: "\n".join(n.get_content() for n in info["nodes"])
+            + "\n"
+            + info["summary"]
+            for doc, info in extra_info_dict.items()
+        }
+        # Single words also used in lowercase, e.g. "Revenue" in a heading,
+        # are common words rather than names
+        lowercase_words = set()
+        for text in doc_texts.values():
+            lowercase_words.update(_LOWERCASE_WORD_RE.findall(text))
+
+        section_texts = []
+        for doc, info in extra_info_dict.items():
+            nodes = info["nodes"]
+            text = doc_texts[doc]
+            terms = Counter(tokenize(text))
+            for term, count in terms.items():
+                router.keyword_postings.setdefault(term, {})[doc] = count
+            router.doc_lengths[doc] = sum(terms.values())
+
+            for entity in extract_entities(text, skip_sentence_initial=True):
+                if " " in entity or entity not in lowercase_words:
+                    router.entity_postings.setdefault(entity, set()).add(doc)
+
+            router.metadata[doc] = {
+                "document": doc,
+                **(nodes[0].metadata if nodes else {}),
+            }
+
+            # Nodes from section-aware chunking share a "section" key; otherwise
+            # every node is its own section
+            sections = defaultdict(list)
+            for i, node in enumerate(nodes):
+                sections[node.metadata.get("section", i)].append(node.get_content())
+            for texts in sections.values():
+                router.section_docs.append(doc)
+                section_texts.append("\n".join(texts)[:SECTION_CHARS])
+
+        if section_texts:
+            embeddings = np.asarray(
+                embed_model.get_text_embedding_batch(section_texts), dtype=np.float32
+            )
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            router.section_embeddings = embeddings / np.maximum(norms, 1e-12)
+        return router
+
+    def _keyword_scores(self, query: str) -> Dict[str, float]:
+        n_docs = len(self.doc_lengths)
+        avg_len = sum(self.doc_lengths.values()) / max(n_docs, 1) or 1.0
+        k1, b = 1.5, 0.75
+        scores = defaultdict(float)
+        for term in set(tokenize(query)):
+            postings = self.keyword_postings.get(term, {})
+            if not postings:
+                continue
+            idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc, tf in postings.items():
+                length_norm = 1 - b + b * self.doc_lengths[doc] / avg_len
+                scores[doc] += idf * tf * (k1 + 1) / (tf + k1 * length_norm)
+        return scores
+
+    def _entity_scores(self, query: str) -> Dict[str, float]:
+        scores = defaultdict(float)
+        for entity in extract_entities(query):
+            docs = self.entity_postings.get(entity, ())
+            # Entities found in every document do not help routing
+            if docs and len(docs) < len(self.doc_lengths):
+                for doc in docs:
+                    scores[doc] += 1.0 / len(docs)
+        return scores
+
+    def _unique_entity_docs(self, query: str) -> set:
+        """Documents that are the only one mentioning some query entity."""
+        docs = set()
+        for entity in extract_entities(query):
+            postings = self.entity_postings.get(entity, ())
+            if len(postings) == 1:
+                docs.update(postings)
+        return docs
+
+    def _embedding_scores(self, query_embedding) -> Dict[str, float]:
+        if self.section_embeddings is None or query_embedding is None:
+            return {}
+        query = np.asarray(query_embedding, dtype=np.float32)
+        query = query / max(float(np.linalg.norm(query)), 1e-12)
+        similarities = self.section_embeddings @ query
+        scores = {}
+        for doc, similarity in zip(self.section_docs, similarities):
+            scores[doc] = max(scores.get(doc, -1.0), float(similarity))
+        return scores
+
+    def route(
+        self,
+        query: str,
+        query_embedding=None,
+        filters: Optional[Dict] = None,
+        direct_threshold: float = config.ROUTER_DIRECT_THRESHOLD,
+        coverage: float = config.ROUTER_COVERAGE,
+        max_documents: int = config.ROUTER_MAX_DOCUMENTS,
+    ) -> RoutingDecision:
+        """Select the smallest set of documents covering `coverage` of the routing probability."""
+        candidates = [
+            doc
+            for doc, meta in self.metadata.items()
+            if all(meta.get(key) == value for key, value in (filters or {}).items())
+        ]
+        if not candidates:
+            return RoutingDecision([], {}, 0.0, False)
+
+        def normalized(scores: Dict[str, float]) -> Dict[str, float]:
+            top = max((scores.get(doc, 0.0) for doc in candidates), default=0.0)
+            return {
+                doc: scores.get(doc, 0.0) / top if top > 0 else 0.0
+                for doc in candidates
+            }
+
+        keyword = normalized(self._keyword_scores(query))
+        entity = normalized(self._entity_scores(query))
+        embedding = self._embedding_scores(query_embedding)
+        combined = {
+            doc: config.ROUTER_KEYWORD_WEIGHT * keyword[doc]
+            + config.ROUTER_ENTITY_WEIGHT * entity[doc]
+            + config.ROUTER_EMBEDDING_WEIGHT * embedding.get(doc, 0.0)
+            for doc in candidates
+        }
+
+        # Softmax turns the combined scores into routing probabilities
+        top = max(combined.values())
+        weights = {
+            doc: math.exp((score - top) / config.ROUTER_TEMPERATURE)
+            for doc, score in combined.items()
+        }
+        total = sum(weights.values())
+        probabilities = {doc: w / total for doc, w in weights.items()}
+
+        ranked = sorted(probabilities, key=probabilities.get, reverse=True)
+        selected, covered = set(), 0.0
+        for doc in ranked:
+            selected.add(doc)
+            covered += probabilities[doc]
+            if covered >= coverage:
+                break
+        # A document that is the only one mentioning a query entity is needed
+        # even when another document dominates, e.g. in comparisons; entities
+        # shared by several documents are left to the probabilities
+        selected.update(self._unique_entity_docs(query) & set(candidates))
+        documents = [doc for doc in ranked if doc in selected][:max_documents]
+
+        confidence = probabilities[ranked[0]]
+        return RoutingDecision(
+            documents=documents,
+            scores=probabilities,
+            confidence=confidence,
+            direct=len(documents) == 1 and confidence >= direct_threshold,
+        )
+
+    async def aroute(self, query: str, embed_model, **kwargs) -> RoutingDecision:
+        query_embedding = None
+        if self.section_embeddings is not None:
+            query_embedding = await embed_model.aget_query_embedding(query)
+        return self.route(query, query_embedding, **kwargs)
@@ -0,0 +1,199 @@
+"""
+Agentic RAG query service
+
+Long-running HTTP service that builds the RAG pipeline once and serves
+concurrent queries from it. Run from the `src` directory with
+`python -m agentic_rag.service`.
+"""
+
+import asyncio
+import json
+import uuid
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Optional
+
+import uvicorn
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import Response, StreamingResponse
+from llama_index.core.agent.workflow import AgentStream
+from pydantic import BaseModel
+
+from agentic_rag.config import config
+from agentic_rag.pipeline import NoMatchingDocumentsError, RagPipeline
+from llm_scheduler.scheduler import Priority, llm_session, scheduler
+
+DISCONNECT_POLL_SECONDS = 0.5
+
+
+class QueryRequest(BaseModel):
+    query: str
+    # Label echoed back to the client; LLM scheduling always uses a per-request id
+    session_id: Optional[str] = None
+    stream: bool = False
+    # Exact-match document metadata filters for routing, e.g. {"document": "documents_nvidia"}
+    filters: Optional[Dict[str, Any]] = None
+
+
+class PipelineHolder:
+    """Holds the live pipeline and swaps in a rebuilt one on reload.
+
+    Each request takes a reference to the pipeline when it starts, so
+    in-flight queries finish on the pipeline they began with.
+    """
+
+    def __init__(self):
+        self.pipeline: Optional[RagPipeline] = None
+        self.reloading = False
+        self.last_reload_error: Optional[str] = None
+        self._reload_task: Optional[asyncio.Task] = None
+
+    async def load(self) -> None:
+        self.reloading = True
+        try:
+            # Ingestion LLM calls (document summaries) yield to live queries
+            with llm_session("ingestion", Priority.BACKGROUND):
+                self.pipeline = await RagPipeline.build(
+                    config.DOCUMENTS_DIR,
+                    self.pipeline.doc_agent_builder if self.pipeline else None,
+                )
+        finally:
+            self.reloading = False
+
+    def start_reload(self) -> bool:
+        """Rebuild the pipeline in the background, unless a rebuild is running."""
+        if self.reloading:
+            return False
+        self.reloading = True
+        self._reload_task = asyncio.create_task(self.load())
+        self._reload_task.add_done_callback(self._on_reload_done)
+        return True
+
+    def _on_reload_done(self, task: asyncio.Task) -> None:
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is None:
+            self.last_reload_error = None
+            return
+        # The previous pipeline keeps serving; report the failure in /health
+        self.last_reload_error = f"{type(error).__name__}: {error}"
+        print(f"Reload failed: {self.last_reload_error}")
+
+
+holder = PipelineHolder()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await holder.load()
+    yield
+    if holder.pipeline is not None:
+        await holder.pipeline.aclose()
+
+
+app = FastAPI(title="Agentic RAG", lifespan=lifespan)
+
+
+async def cancel_query(handler, request_id: str) -> None:
+    """Stop a run and free its queued LLM requests."""
+    scheduler.cancel_session(request_id)
+    await handler.cancel_run()
+
+
+async def wait_for_disconnect(request: Request) -> None:
+    while not await request.is_disconnected():
+        await asyncio.sleep(DISCONNECT_POLL_SECONDS)
+
+
+async def stream_response(request: Request, handler, request_id: str):
+    completed = False
+    try:
+        async for ev in handler.stream_events():
+            if await request.is_disconnected():
+                return
+            if isinstance(ev, AgentStream) and ev.delta:
+                yield json.dumps({"delta": ev.delta}) + "\n"
+        response = await handler
+        completed = True
+        yield json.dumps({"response": str(response), "done": True}) + "\n"
+    finally:
+        if not completed:
+            await cancel_query(handler, request_id)
+
+
+@app.post("/query")
+async def query(body: QueryRequest, request: Request):
+    pipeline = holder.pipeline
+    # Cancelling a scheduler session cancels all of its LLM requests, so each
+    # request gets its own rather than sharing the client's session_id
+    request_id = str(uuid.uuid4())
+    with llm_session(request_id, Priority.INTERACTIVE):
+        try:
+            handler = await pipeline.run(body.query, body.filters)
+        except NoMatchingDocumentsError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+
+    if body.stream:
+        return StreamingResponse(
+            stream_response(request, handler, request_id),
+            media_type="application/x-ndjson",
+        )
+
+    # Starlette does not cancel non-streaming handlers when the client goes
+    # away, so watch for the disconnect alongside the run
+    disconnect = asyncio.create_task(wait_for_disconnect(request))
+    try:
+        await asyncio.wait({handler, disconnect}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        disconnect.cancel()
+    if not handler.done():
+        await cancel_query(handler, request_id)
+        return Response(status_code=499)
+    return {
+        "session_id": body.session_id,
+        "request_id": request_id,
+        "response": str(handler.result()),
+    }
+
+
+@app.post("/reload", status_code=202)
+async def reload():
+    """Re-ingest documents in the background and swap in the new pipeline."""
+    if not holder.start_reload():
+        return {"status": "already reloading"}
+    return {"status": "reloading"}
+
+
+@app.post("/route")
+async def route(body: QueryRequest):
+    """Show which document agents a query would be routed to."""
+    decision = await holder.pipeline.route(body.query, body.filters)
+    return {
+        "documents": decision.documents,
+        "scores": decision.scores,
+        "confidence": decision.confidence,
+        "direct": decision.direct,
+    }
+
+
+@app.get("/health")
+async def health():
+    if holder.pipeline is None:
+        status = "loading"
+    else:
+        status = "degraded" if holder.last_reload_error else "ok"
+    return {
+        "status": status,
+        "reloading": holder.reloading,
+        "last_reload_error": holder.last_reload_error,
+        "documents": sorted(holder.pipeline.agents_dict) if holder.pipeline else [],
+    }
+
+
+@app.get("/metrics")
+async def metrics():
+    return scheduler.metrics()
+
+
+if __name__ == "__main__":
+    uvicorn.run(app, host=config.SERVICE_HOST, port=config.SERVICE_PORT)
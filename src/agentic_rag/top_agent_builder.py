@@ -12,20 +12,39 @@ class CustomObjectRetriever(ObjectRetriever):
         object_node_mapping,
         node_postprocessors=None,
         llm=None,
+        tools=None,
     ):
         self._retriever = retriever
         self._object_node_mapping = object_node_mapping
         self._llm = llm
         self._node_postprocessors = node_postprocessors or []
+        self._tools = tools
+
+    def with_tools(self, tools) -> "CustomObjectRetriever":
+        """Return a retriever that serves a fixed tool set instead of searching the index."""
+        return CustomObjectRetriever(
+            self._retriever,
+            self._object_node_mapping,
+            node_postprocessors=self._node_postprocessors,
+            llm=self._llm,
+            tools=tools,
+        )
 
     def retrieve(self, query_bundle):
         if isinstance(query_bundle, str):
             query_bundle = QueryBundle(query_str=query_bundle)
 
-        nodes = self._retriever.retrieve(query_bundle)
-        for processor in self._node_postprocessors:
-            nodes = processor.postprocess_nodes(nodes, query_bundle=query_bundle)
-        tools = [self._object_node_mapping.from_node(n.node) for n in nodes]
+        if self._tools is not None:
+            tools = list(self._tools)
+        else:
+            nodes = self._retriever.retrieve(query_bundle)
+            for processor in self._node_postprocessors:
+                nodes = processor.postprocess_nodes(nodes, query_bundle=query_bundle)
+            tools = [self._object_node_mapping.from_node(n.node) for n in nodes]
+
+        # Comparing needs at least two documents
+        if len(tools) < 2:
+            return tools
 
         sub_agent = FunctionAgent(
             name="compare_tool",
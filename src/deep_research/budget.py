@@ -0,0 +1,137 @@
+"""
+Run Budget
+
+Bounds a multi-agent run by handoffs, LLM calls, tokens and wall time, and
+detects structured reviewer approval so runs can stop as soon as a report is
+accepted instead of cycling between agents.
+
+web_research/budget.py has the same RunBudget; both entry points run as
+scripts from their own directories and import their own config, so each keeps
+only what it uses.
+"""
+
+import json
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from config import config
+
+_APPROVAL_RE = re.compile(r"^\W*(acceptable|approved?)\b", re.IGNORECASE)
+_REJECTION_RE = re.compile(
+    r"\b(not|isn't|is not|un)\s*(acceptable|approved?)\b", re.IGNORECASE
+)
+_APPROVED_KEY_RE = re.compile(r'"approved"\s*:')
+
+
+def is_true(value: Any) -> bool:
+    """Only a JSON true or the string "true" counts, so "false" is not approval."""
+    if isinstance(value, bool):
+        return value
+    return isinstance(value, str) and value.strip().lower() == "true"
+
+
+def is_approved(review: str) -> bool:
+    """Detect reviewer approval.
+
+    Uses the first JSON object with an "approved" field in the text. The
+    leading ACCEPTABLE/APPROVED verdict fallback, which must not be negated,
+    only applies when the text has no "approved" key at all.
+
+    >>> is_approved('{"approved": true}')
+    True
+    >>> is_approved('{"approved": false}\\n- How does {framework} scale?')
+    False
+    >>> is_approved('{"approved": "false"}')
+    False
+    >>> is_approved("ACCEPTABLE. The report covers the topic.")
+    True
+    >>> is_approved("Not acceptable, add benchmarks.")
+    False
+    """
+    decoder = json.JSONDecoder()
+    for match in re.finditer(r"\{", review):
+        try:
+            verdict, _ = decoder.raw_decode(review, match.start())
+        except json.JSONDecodeError:
+            continue
+        if isinstance(verdict, dict) and "approved" in verdict:
+            return is_true(verdict["approved"])
+    if _APPROVED_KEY_RE.search(review):
+        # A verdict was given but could not be parsed; never read it as approval
+        return False
+    return bool(_APPROVAL_RE.match(review)) and not _REJECTION_RE.search(review)
+
+
+def count_usage_tokens(raw: Any, text: str = "") -> int:
+    """Extract token usage from a raw LLM response, estimating when absent."""
+    if raw is not None and not isinstance(raw, dict):
+        raw = getattr(raw, "model_dump", lambda: {})()
+    raw = raw or {}
+    # Ollama reports prompt_eval_count/eval_count, OpenAI-style APIs report usage
+    if "eval_count" in raw or "prompt_eval_count" in raw:
+        return int(raw.get("prompt_eval_count") or 0) + int(raw.get("eval_count") or 0)
+    usage = raw.get("usage") or {}
+    if usage.get("total_tokens"):
+        return int(usage["total_tokens"])
+    return len(text) // 4
+
+
+@dataclass
+class RunBudget:
+    """Limits and consumption counters for a single workflow run.
+
+    A limit of None disables that check.
+    """
+
+    max_handoffs: Optional[int] = config.MAX_HANDOFFS
+    max_llm_calls: Optional[int] = config.MAX_LLM_CALLS
+    max_tokens: Optional[int] = config.MAX_TOKENS
+    max_wall_time: Optional[float] = config.MAX_WALL_TIME_SECONDS
+    handoffs: int = 0
+    llm_calls: int = 0
+    tokens: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    def record_llm_call(self, raw: Any = None, text: str = "") -> None:
+        self.llm_calls += 1
+        self.tokens += count_usage_tokens(raw, text)
+
+    def record_handoff(self) -> None:
+        self.handoffs += 1
+
+    def exceeded(self, include_handoffs: bool = True) -> Optional[str]:
+        """Return the name of the first exhausted budget, or None.
+
+        With include_handoffs=False only the resource budgets are checked, for
+        work that happens within the current handoff.
+        """
+        checks = [
+            ("llm_calls", self.llm_calls, self.max_llm_calls),
+            ("tokens", self.tokens, self.max_tokens),
+            ("wall_time", self.elapsed, self.max_wall_time),
+        ]
+        if include_handoffs:
+            checks.insert(0, ("handoffs", self.handoffs, self.max_handoffs))
+        for name, used, limit in checks:
+            if limit is not None and used >= limit:
+                return name
+        return None
+
+    def report(self) -> str:
+        """Summarize budget consumption for logging."""
+
+        def fmt(used, limit):
+            return f"{used}/{limit}" if limit is not None else f"{used}"
+
+        return (
+            f"handoffs={fmt(self.handoffs, self.max_handoffs)} "
+            f"llm_calls={fmt(self.llm_calls, self.max_llm_calls)} "
+            f"tokens={fmt(self.tokens, self.max_tokens)} "
+            f"wall_time={fmt(round(self.elapsed, 1), self.max_wall_time)}s"
+        )
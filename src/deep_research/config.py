@@ -4,6 +4,12 @@ from dataclasses import dataclass
 @dataclass
 class LLMConfigParams:
     DEFAULT_MODEL: str = "qwen2.5:14b-instruct-q4_K_M"
+    # Run budget per workflow run (None disables a limit)
+    # Handoffs are review feedback loops back to question generation
+    MAX_HANDOFFS: int = 2
+    MAX_LLM_CALLS: int = 120
+    MAX_TOKENS: int = 400_000
+    MAX_WALL_TIME_SECONDS: float = 3600
 
 
 # Create a singleton instance
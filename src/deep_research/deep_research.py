@@ -7,12 +7,11 @@ to conduct comprehensive research on a given topic.
 
 import os
 import asyncio
-from typing import Optional
+from functools import lru_cache
+from typing import Dict, Optional
 import httpx
 from tenacity import retry, stop_after_attempt, wait_exponential
 
-from tavily import AsyncTavilyClient
-from llama_index.llms.ollama import Ollama
 from config import config
 from llama_index.core.workflow import (
     Context,
@@ -23,20 +22,28 @@ from llama_index.core.workflow import (
     step,
     WorkflowTimeoutError,
 )
-from llama_index.core.agent.workflow import FunctionAgent
-
-# Initialize core components with increased timeout
-llm = Ollama(
-    model=config.DEFAULT_MODEL,
-    timeout=120,  # Increased timeout for individual requests
-    temperature=0.7,
-    context_window=4096,
-    num_ctx=4096,
-    request_timeout=120,  # Added request timeout
-)
+from llama_index.core.agent.workflow import AgentOutput, FunctionAgent
+from budget import RunBudget, is_approved
+
 tavily_api_key = os.environ.get("TAVILY_API_KEY")
 
 
+@lru_cache(maxsize=None)
+def get_llm():
+    """Create the Ollama client on first use rather than at import time."""
+    from llama_index.llms.ollama import Ollama
+
+    # Initialize core components with increased timeout
+    return Ollama(
+        model=config.DEFAULT_MODEL,
+        timeout=120,  # Increased timeout for individual requests
+        temperature=0.7,
+        context_window=4096,
+        num_ctx=4096,
+        request_timeout=120,  # Added request timeout
+    )
+
+
 # Event definitions
 class GenerateEvent(Event):
     """Event for initiating research on a topic."""
@@ -83,6 +90,8 @@ class ReviewEvent(Event):
 )
 async def search_web_with_retry(query: str) -> str:
     """Search the web for information using Tavily API with retry logic."""
+    from tavily import AsyncTavilyClient
+
     try:
         client = AsyncTavilyClient(api_key=tavily_api_key)
         return str(await client.search(query))
@@ -117,41 +126,53 @@ async def review_report(ctx: Context, review: str) -> str:
     return "Report reviewed."
 
 
-# Agent definitions
-question_agent = FunctionAgent(
-    tools=[],
-    llm=llm,
-    verbose=False,
-    system_prompt="""You are part of a deep research system.
-    Given a research topic, generate a list of questions that will help create
-    a comprehensive report. Provide one question per line without markdown or preamble.""",
-)
-
-answer_agent = FunctionAgent(
-    tools=[search_web_with_retry],
-    llm=llm,
-    verbose=False,
-    system_prompt="""You are part of a deep research system.
-    Given a specific question, provide a detailed answer using web search
-    capabilities. Return only the answer without preamble or markdown.""",
-)
+async def run_agent(agent: FunctionAgent, user_msg: str, budget: RunBudget) -> str:
+    """Run an agent, recording each of its LLM calls against the run budget."""
+    handler = agent.run(user_msg=user_msg)
+    async for ev in handler.stream_events():
+        if isinstance(ev, AgentOutput):
+            budget.record_llm_call(ev.raw, ev.response.content or "")
+    return str(await handler)
 
-report_agent = FunctionAgent(
-    tools=[],
-    llm=llm,
-    verbose=False,
-    system_prompt="""You are part of a deep research system.
-    Given a set of question-answer pairs, synthesize them into a comprehensive report.""",
-)
 
-review_agent = FunctionAgent(
-    tools=[],
-    llm=llm,
-    verbose=False,
-    system_prompt="""You are part of a deep research system.
-    Review a research report and either approve it as comprehensive or suggest
-    additional questions for improvement.""",
-)
+# Agent definitions
+def create_agents() -> Dict[str, FunctionAgent]:
+    """Build the research agents, keyed by the workflow's StartEvent fields."""
+    llm = get_llm()
+    return {
+        "question_agent": FunctionAgent(
+            tools=[],
+            llm=llm,
+            verbose=False,
+            system_prompt="""You are part of a deep research system.
+            Given a research topic, generate a list of questions that will help create
+            a comprehensive report. Provide one question per line without markdown or preamble.""",
+        ),
+        "answer_agent": FunctionAgent(
+            tools=[search_web_with_retry],
+            llm=llm,
+            verbose=False,
+            system_prompt="""You are part of a deep research system.
+            Given a specific question, provide a detailed answer using web search
+            capabilities. Return only the answer without preamble or markdown.""",
+        ),
+        "report_agent": FunctionAgent(
+            tools=[],
+            llm=llm,
+            verbose=False,
+            system_prompt="""You are part of a deep research system.
+            Given a set of question-answer pairs, synthesize them into a comprehensive report.""",
+        ),
+        "review_agent": FunctionAgent(
+            tools=[],
+            llm=llm,
+            verbose=False,
+            system_prompt="""You are part of a deep research system.
+            Review a research report and either approve it as comprehensive or suggest
+            additional questions for improvement. Respond only with a JSON object of the form
+            {"approved": true or false, "feedback": "additional questions if not approved"}.""",
+        ),
+    }
 
 
 class DeepResearchWithReflectionWorkflow(Workflow):
@@ -164,7 +185,7 @@ class DeepResearchWithReflectionWorkflow(Workflow):
         self.answer_agent = ev.answer_agent
         self.report_agent = ev.report_agent
         self.review_agent = ev.review_agent
-        self.review_cycles = 0
+        self.budget = ev.get("budget") or RunBudget()
 
         ctx.write_event_to_stream(ProgressEvent(msg="Starting research"))
         return GenerateEvent(research_topic=ev.research_topic)
@@ -189,8 +210,8 @@ class DeepResearchWithReflectionWorkflow(Workflow):
                 f"\nConsider previous feedback for additional questions: {ev.feedback}"
             )
 
-        result = await self.question_agent.run(user_msg=prompt)
-        questions = [line.strip() for line in str(result).split("\n") if line.strip()]
+        result = await run_agent(self.question_agent, prompt, self.budget)
+        questions = [line.strip() for line in result.split("\n") if line.strip()]
 
         await ctx.set("total_questions", len(questions))
         for question in questions:
@@ -199,18 +220,24 @@ class DeepResearchWithReflectionWorkflow(Workflow):
     @step
     async def answer_question(self, ctx: Context, ev: QuestionEvent) -> AnswerEvent:
         """Generate an answer for a specific research question with retry logic."""
+        exceeded = self.budget.exceeded(include_handoffs=False)
+        if exceeded is not None:
+            # Still emit an answer so write_report can collect all of them
+            return AnswerEvent(
+                question=ev.question,
+                answer=f"Not researched: run budget exceeded ({exceeded}).",
+            )
+
         try:
-            result = await self.answer_agent.run(
-                user_msg=f"Research and answer: {ev.question}"
+            result = await run_agent(
+                self.answer_agent, f"Research and answer: {ev.question}", self.budget
             )
 
             ctx.write_event_to_stream(
-                ProgressEvent(
-                    msg=f"Answered question: {ev.question}\nAnswer: {str(result)}"
-                )
+                ProgressEvent(msg=f"Answered question: {ev.question}\nAnswer: {result}")
             )
 
-            return AnswerEvent(question=ev.question, answer=str(result))
+            return AnswerEvent(question=ev.question, answer=result)
         except httpx.ReadTimeout:
             print(f"Timeout while answering question: {ev.question}")
             # Return a placeholder answer in case of timeout
@@ -240,30 +267,47 @@ class DeepResearchWithReflectionWorkflow(Workflow):
             f"Question: {qa.question}\nAnswer: {qa.answer}" for qa in research
         )
 
-        result = await self.report_agent.run(
-            user_msg=f"""Topic: {await ctx.get("research_topic")}
+        result = await run_agent(
+            self.report_agent,
+            f"""Topic: {await ctx.get("research_topic")}
             Compile a comprehensive report from these Q&A pairs:
-            {all_answers}"""
+            {all_answers}""",
+            self.budget,
         )
 
-        return ReviewEvent(report=str(result))
+        return ReviewEvent(report=result)
 
     @step
     async def review(self, ctx: Context, ev: ReviewEvent) -> StopEvent | FeedbackEvent:
         """Review the report and decide if more research is needed."""
-        result = await self.review_agent.run(
-            user_msg=f"""Review this report on {await ctx.get("research_topic")}:
-            {ev.report}
-            Respond with "ACCEPTABLE" if comprehensive, or suggest additional questions."""
-        )
-
-        self.review_cycles += 1
-        if str(result) == "ACCEPTABLE" or self.review_cycles >= 3:
+        if self.budget.exceeded(include_handoffs=False) is None:
+            result = await run_agent(
+                self.review_agent,
+                f"""Review this report on {await ctx.get("research_topic")}:
+                {ev.report}
+                Respond with {{"approved": true}} if comprehensive, or with
+                {{"approved": false, "feedback": "..."}} suggesting additional questions.""",
+                self.budget,
+            )
+            approved = is_approved(result)
+        else:
+            result, approved = "", False
+
+        # Checked before handing off, so the last allowed cycle is fully
+        # researched and reviewed rather than started and left empty
+        stop_reason = "approved" if approved else self.budget.exceeded()
+        if stop_reason is not None:
+            ctx.write_event_to_stream(
+                ProgressEvent(
+                    msg=f"Research finished ({stop_reason}): {self.budget.report()}"
+                )
+            )
             return StopEvent(result=ev.report)
 
+        self.budget.record_handoff()
         ctx.write_event_to_stream(ProgressEvent(msg="Requesting additional research"))
         return FeedbackEvent(
-            research_topic=await ctx.get("research_topic"), feedback=str(result)
+            research_topic=await ctx.get("research_topic"), feedback=result
         )
 
 
@@ -271,13 +315,12 @@ async def main():
     """Run the deep research workflow."""
     try:
         # Increase timeout to 1 hour (3600 seconds)
-        workflow = DeepResearchWithReflectionWorkflow(timeout=3600)
+        budget = RunBudget()
+        workflow = DeepResearchWithReflectionWorkflow(timeout=budget.max_wall_time)
         handler = workflow.run(
+            budget=budget,
             research_topic="Comparison of AgenticAI frameworks: LangGraph, CrewAI, and AutoGen",
-            question_agent=question_agent,
-            answer_agent=answer_agent,
-            report_agent=report_agent,
-            review_agent=review_agent,
+            **create_agents(),
         )
 
         # Stream progress events
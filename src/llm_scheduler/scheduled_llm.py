@@ -0,0 +1,115 @@
+"""
+Scheduled Ollama client
+
+An Ollama LLM whose requests go through the shared LLMScheduler, so every
+module in the process queues fairly for the same inference server.
+"""
+
+import asyncio
+from contextvars import ContextVar
+from typing import Any, Sequence
+
+from llama_index.core.base.llms.types import ChatMessage
+from llama_index.llms.ollama import Ollama
+from pydantic import PrivateAttr
+
+from llm_scheduler.scheduler import Lease, LLMScheduler, scheduler as shared_scheduler
+
+# Set while a request holds a slot, so completion helpers that delegate to
+# chat inside Ollama do not queue a second time for the same request.
+_holding_slot: ContextVar[bool] = ContextVar("llm_holding_slot", default=False)
+
+
+class ScheduledStream:
+    """A streamed response that holds its scheduler slot until the stream ends.
+
+    The slot is released when the stream is exhausted, fails or is closed, and
+    when it is garbage-collected unconsumed, so an abandoned stream cannot keep
+    the backend busy.
+    """
+
+    def __init__(self, gen, scheduler: LLMScheduler, lease: Lease):
+        self._gen = gen
+        self._scheduler = scheduler
+        self._lease = lease
+        self._loop = asyncio.get_running_loop()
+        self._released = False
+
+    def _release(self) -> None:
+        if not self._released:
+            self._released = True
+            self._scheduler.release(self._lease)
+
+    def __aiter__(self) -> "ScheduledStream":
+        return self
+
+    async def __anext__(self):
+        try:
+            return await self._gen.__anext__()
+        except BaseException:
+            # Includes StopAsyncIteration at the end of the stream
+            self._release()
+            raise
+
+    async def aclose(self) -> None:
+        self._release()
+        await self._gen.aclose()
+
+    def __del__(self):
+        if not self._released and not self._loop.is_closed():
+            self._released = True
+            self._loop.call_soon_threadsafe(self._scheduler.release, self._lease)
+
+
+class ScheduledOllama(Ollama):
+    _scheduler: LLMScheduler = PrivateAttr()
+
+    def __init__(self, scheduler: LLMScheduler = shared_scheduler, **kwargs: Any):
+        super().__init__(**kwargs)
+        self._scheduler = scheduler
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "ScheduledOllama"
+
+    async def _run_scheduled(self, fn, *args, **kwargs):
+        if _holding_slot.get():
+            return await fn(*args, **kwargs)
+        async with self._scheduler.slot(self.base_url):
+            token = _holding_slot.set(True)
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                _holding_slot.reset(token)
+
+    async def _stream_scheduled(self, fn, *args, **kwargs):
+        if _holding_slot.get():
+            return await fn(*args, **kwargs)
+        lease = await self._scheduler.acquire(self.base_url)
+        token = _holding_slot.set(True)
+        try:
+            gen = await fn(*args, **kwargs)
+        except BaseException:
+            self._scheduler.release(lease)
+            raise
+        finally:
+            _holding_slot.reset(token)
+
+        # The request runs while the stream is consumed, so hold the slot until it ends
+        return ScheduledStream(gen, self._scheduler, lease)
+
+    async def achat(self, messages: Sequence[ChatMessage], **kwargs: Any):
+        return await self._run_scheduled(super().achat, messages, **kwargs)
+
+    async def acomplete(self, prompt: str, formatted: bool = False, **kwargs: Any):
+        return await self._run_scheduled(super().acomplete, prompt, formatted, **kwargs)
+
+    async def astream_chat(self, messages: Sequence[ChatMessage], **kwargs: Any):
+        return await self._stream_scheduled(super().astream_chat, messages, **kwargs)
+
+    async def astream_complete(
+        self, prompt: str, formatted: bool = False, **kwargs: Any
+    ):
+        return await self._stream_scheduled(
+            super().astream_complete, prompt, formatted, **kwargs
+        )
@@ -0,0 +1,240 @@
+"""
+LLM Request Scheduler
+
+Coordinates LLM requests from concurrent workflows sharing one inference
+server. Each backend has a concurrency limit; waiting requests are served by
+priority class and, within a class, round-robin across sessions so one busy
+session cannot starve the others.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Deque, Dict, Optional, Tuple
+
+
+class Priority(IntEnum):
+    """Priority classes, lower values are served first."""
+
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+DEFAULT_SESSION = "default"
+
+_current_session: ContextVar[Tuple[str, Priority]] = ContextVar(
+    "llm_session", default=(DEFAULT_SESSION, Priority.INTERACTIVE)
+)
+
+
+@contextmanager
+def llm_session(session_id: str, priority: Priority = Priority.INTERACTIVE):
+    """Attribute LLM requests made in this context to a session and priority.
+
+    The context is inherited by tasks created inside it, so wrapping the
+    creation of a workflow run covers every agent and tool it spawns.
+    """
+    token = _current_session.set((session_id, priority))
+    try:
+        yield
+    finally:
+        _current_session.reset(token)
+
+
+@dataclass(eq=False)
+class Lease:
+    """A granted slot on a backend."""
+
+    backend: str
+    session_id: str
+    priority: Priority
+    enqueued_at: float
+    future: asyncio.Future
+    task: Optional[asyncio.Task] = None
+
+
+@dataclass
+class BackendMetrics:
+    queue_depth: int = 0
+    in_flight: int = 0
+    granted: int = 0
+    cancelled: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+    @property
+    def mean_wait(self) -> float:
+        return self.total_wait / self.granted if self.granted else 0.0
+
+
+@dataclass
+class BackendQueue:
+    """Waiting requests for one backend, by priority then session."""
+
+    max_concurrency: int
+    metrics: BackendMetrics = field(default_factory=BackendMetrics)
+    waiting: Dict[Priority, "OrderedDict[str, Deque[Lease]]"] = field(
+        default_factory=lambda: {p: OrderedDict() for p in Priority}
+    )
+
+    def push(self, lease: Lease) -> None:
+        self.waiting[lease.priority].setdefault(lease.session_id, deque()).append(lease)
+        self.metrics.queue_depth += 1
+
+    def pop(self) -> Optional[Lease]:
+        for priority in Priority:
+            sessions = self.waiting[priority]
+            if not sessions:
+                continue
+            session_id, leases = next(iter(sessions.items()))
+            lease = leases.popleft()
+            # Rotate the session to the back so the next grant goes to another session
+            del sessions[session_id]
+            if leases:
+                sessions[session_id] = leases
+            self.metrics.queue_depth -= 1
+            return lease
+        return None
+
+    def remove(self, lease: Lease) -> bool:
+        leases = self.waiting[lease.priority].get(lease.session_id)
+        if not leases or lease not in leases:
+            return False
+        leases.remove(lease)
+        if not leases:
+            del self.waiting[lease.priority][lease.session_id]
+        self.metrics.queue_depth -= 1
+        return True
+
+
+class LLMScheduler:
+    """In-process scheduler shared by every LLM client talking to a backend."""
+
+    def __init__(self, default_concurrency: int = 1):
+        self.default_concurrency = default_concurrency
+        self._backends: Dict[str, BackendQueue] = {}
+        self._in_flight: Dict[str, set] = {}
+
+    def set_backend_limit(self, backend: str, max_concurrency: int) -> None:
+        """Set how many requests may run concurrently against a backend."""
+        queue = self._queue(backend)
+        queue.max_concurrency = max_concurrency
+        self._dispatch(queue)
+
+    def _queue(self, backend: str) -> BackendQueue:
+        if backend not in self._backends:
+            self._backends[backend] = BackendQueue(self.default_concurrency)
+        return self._backends[backend]
+
+    def _dispatch(self, queue: BackendQueue) -> None:
+        while queue.metrics.in_flight < queue.max_concurrency:
+            lease = queue.pop()
+            if lease is None:
+                return
+            if lease.future.done():
+                continue
+            queue.metrics.in_flight += 1
+            lease.future.set_result(None)
+
+    async def acquire(
+        self,
+        backend: str,
+        priority: Optional[Priority] = None,
+        session_id: Optional[str] = None,
+    ) -> Lease:
+        """Wait for a slot on backend; session and priority default to the current llm_session."""
+        current_session, current_priority = _current_session.get()
+        lease = Lease(
+            backend=backend,
+            session_id=session_id or current_session,
+            priority=current_priority if priority is None else priority,
+            enqueued_at=time.monotonic(),
+            future=asyncio.get_running_loop().create_future(),
+        )
+        queue = self._queue(backend)
+        queue.push(lease)
+        self._dispatch(queue)
+
+        try:
+            await lease.future
+        except asyncio.CancelledError:
+            if lease.future.done() and not lease.future.cancelled():
+                # Granted and cancelled in the same tick: hand the slot back
+                self._release_slot(queue)
+            else:
+                queue.remove(lease)
+            queue.metrics.cancelled += 1
+            raise
+
+        wait = time.monotonic() - lease.enqueued_at
+        queue.metrics.granted += 1
+        queue.metrics.total_wait += wait
+        queue.metrics.max_wait = max(queue.metrics.max_wait, wait)
+
+        lease.task = asyncio.current_task()
+        self._in_flight.setdefault(lease.session_id, set()).add(lease)
+        return lease
+
+    def release(self, lease: Lease) -> None:
+        """Return a slot acquired with acquire()."""
+        session_leases = self._in_flight.get(lease.session_id, set())
+        session_leases.discard(lease)
+        if not session_leases:
+            self._in_flight.pop(lease.session_id, None)
+        self._release_slot(self._queue(lease.backend))
+
+    def _release_slot(self, queue: BackendQueue) -> None:
+        queue.metrics.in_flight -= 1
+        self._dispatch(queue)
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        backend: str,
+        priority: Optional[Priority] = None,
+        session_id: Optional[str] = None,
+    ):
+        lease = await self.acquire(backend, priority, session_id)
+        try:
+            yield lease
+        finally:
+            self.release(lease)
+
+    def cancel_session(self, session_id: str) -> int:
+        """Cancel queued and in-flight requests of a session, returning how many."""
+        cancelled = 0
+        for queue in self._backends.values():
+            for priority in Priority:
+                leases = queue.waiting[priority].get(session_id)
+                for lease in list(leases or ()):
+                    queue.remove(lease)
+                    lease.future.cancel()
+                    cancelled += 1
+        for lease in list(self._in_flight.get(session_id, ())):
+            if lease.task is not None and not lease.task.done():
+                lease.task.cancel()
+                cancelled += 1
+        return cancelled
+
+    def metrics(self) -> Dict[str, Dict[str, float]]:
+        """Queue depth, concurrency and wait-time metrics per backend."""
+        return {
+            backend: {
+                "max_concurrency": queue.max_concurrency,
+                "queue_depth": queue.metrics.queue_depth,
+                "in_flight": queue.metrics.in_flight,
+                "granted": queue.metrics.granted,
+                "cancelled": queue.metrics.cancelled,
+                "mean_wait_s": round(queue.metrics.mean_wait, 4),
+                "max_wait_s": round(queue.metrics.max_wait, 4),
+            }
+            for backend, queue in self._backends.items()
+        }
+
+
+# Create a singleton instance shared by every client in the process
+scheduler = LLMScheduler()
@@ -0,0 +1,118 @@
+"""
+Startup Import Profiler
+
+Measures the cold-start import cost of every entry point with
+`python -X importtime`, reports the most expensive top-level imports and,
+with --check, fails when an entry point exceeds its cold-start budget.
+
+Usage (from src):
+    python profile_startup.py              # report for all entry points
+    python profile_startup.py --check      # exit 1 if any budget is exceeded
+    python profile_startup.py deep_research --top 20
+"""
+
+import argparse
+import re
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Tuple
+
+SRC_DIR = Path(__file__).resolve().parent
+
+_IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+@dataclass
+class EntryPoint:
+    name: str
+    module: str
+    cwd: Path
+    # Cold-start budget in seconds for importing the module, interpreter start included
+    budget: float
+
+
+ENTRY_POINTS = [
+    EntryPoint("agentic_rag", "agentic_rag.agentic_rag", SRC_DIR, 4.0),
+    EntryPoint("agentic_rag_service", "agentic_rag.service", SRC_DIR, 5.0),
+    EntryPoint("deep_research", "deep_research", SRC_DIR / "deep_research", 3.0),
+    EntryPoint("web_research", "agentic_workflow", SRC_DIR / "web_research", 3.0),
+    EntryPoint("mcp_client", "mcp_client", SRC_DIR / "simple_mcp", 3.0),
+    EntryPoint("mcp_server", "mcp_server", SRC_DIR / "simple_mcp", 2.0),
+]
+
+
+def profile(entry: EntryPoint) -> Tuple[float, List[Tuple[str, float]]]:
+    """Import the entry point in a fresh interpreter.
+
+    Returns the wall time in seconds and (package, cumulative seconds) for each
+    top-level import, most expensive first.
+    """
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {entry.module}"],
+        cwd=entry.cwd,
+        capture_output=True,
+        text=True,
+    )
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(
+            f"Importing {entry.module} failed:\n{result.stderr.splitlines()[-1]}"
+        )
+
+    top_level = []
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_RE.match(line)
+        # Unindented entries are imported directly, their cost includes children
+        if match and not match.group(3):
+            top_level.append((match.group(4), int(match.group(2)) / 1e6))
+    return elapsed, sorted(top_level, key=lambda item: item[1], reverse=True)
+
+
+def main(args: argparse.Namespace) -> int:
+    unknown = set(args.entries) - {e.name for e in ENTRY_POINTS}
+    if unknown:
+        print(f"Unknown entry points: {', '.join(sorted(unknown))}")
+        return 2
+    entries = [e for e in ENTRY_POINTS if not args.entries or e.name in args.entries]
+    failures = []
+    for entry in entries:
+        try:
+            elapsed, imports = profile(entry)
+        except RuntimeError as e:
+            print(f"\n{entry.name}: {e}")
+            failures.append(entry.name)
+            continue
+
+        status = "OK" if elapsed <= entry.budget else "OVER BUDGET"
+        print(
+            f"\n{entry.name} ({entry.module}): {elapsed:.2f}s / {entry.budget:.1f}s {status}"
+        )
+        for package, seconds in imports[: args.top]:
+            print(f"  {seconds:8.3f}s  {package}")
+        if elapsed > entry.budget:
+            failures.append(entry.name)
+
+    if args.check and failures:
+        print(f"\nCold-start check failed: {', '.join(failures)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Startup import profiler")
+    parser.add_argument(
+        "entries",
+        nargs="*",
+        help=f"entry points to profile: {', '.join(e.name for e in ENTRY_POINTS)} (default: all)",
+    )
+    parser.add_argument("--top", type=int, default=10, help="imports to list per entry")
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="exit with status 1 if a budget is exceeded",
+    )
+    sys.exit(main(parser.parse_args()))
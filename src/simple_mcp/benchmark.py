@@ -0,0 +1,130 @@
+"""
+MCP tool-call latency benchmark
+
+Compares per-call session setup (BasicMCPClient) with the pooled client, with
+and without coalescing concurrent calls into batch_call requests, against
+the local mcp_server.py over both SSE and streamable-HTTP transports.
+
+Usage (from src/simple_mcp):
+    python benchmark.py --calls 200 --concurrency 16
+"""
+
+import argparse
+import asyncio
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from typing import Awaitable, Callable, List
+
+from llama_index.tools.mcp import BasicMCPClient
+
+from config import config
+from mcp_pool import PooledMCPClient
+
+TRANSPORT_URLS = {
+    "sse": config.MCP_SERVER_URL,
+    "streamable-http": config.MCP_STREAMABLE_HTTP_URL,
+}
+
+
+def start_server(transport: str) -> subprocess.Popen:
+    """Start mcp_server.py with the given transport and wait for its port."""
+    server = subprocess.Popen(
+        [sys.executable, "mcp_server.py", transport],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", config.MCP_SERVER_PORT), 0.2).close()
+            return server
+        except OSError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError(f"mcp_server.py did not start with transport {transport}")
+
+
+async def time_calls(
+    call: Callable[[int], Awaitable], calls: int, concurrency: int
+) -> List[float]:
+    """Run calls with bounded concurrency and return per-call latencies."""
+    slots = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def timed(i: int) -> None:
+        async with slots:
+            start = time.perf_counter()
+            await call(i)
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(timed(i) for i in range(calls)))
+    return latencies
+
+
+def report(name: str, latencies: List[float], wall: float) -> None:
+    ms = sorted(latency * 1000 for latency in latencies)
+    p95 = ms[min(len(ms) - 1, int(len(ms) * 0.95))]
+    print(
+        f"{name:<40} p50={statistics.median(ms):8.2f}ms p95={p95:8.2f}ms "
+        f"throughput={len(ms) / wall:8.1f} calls/s"
+    )
+
+
+async def benchmark_transport(transport: str, calls: int, concurrency: int) -> None:
+    url = TRANSPORT_URLS[transport]
+    basic = BasicMCPClient(url)
+    pooled = PooledMCPClient(url, transport=transport)
+    batched = PooledMCPClient(
+        url, transport=transport, batch_tools=config.MCP_BATCH_TOOLS
+    )
+    # Connect once outside the measurement
+    await pooled.list_tools()
+    await batched.list_tools()
+
+    cases = [
+        ("basic (session per call)", basic, 1),
+        ("pooled, sequential", pooled, 1),
+        (f"pooled, {concurrency} concurrent", pooled, concurrency),
+        (f"pooled+batched, {concurrency} concurrent", batched, concurrency),
+    ]
+    for name, client, case_concurrency in cases:
+
+        async def call(i: int, client=client):
+            return await client.call_tool("calculator_tool", {"a": i, "b": 1})
+
+        start = time.perf_counter()
+        latencies = await time_calls(call, calls, case_concurrency)
+        report(f"[{transport}] {name}", latencies, time.perf_counter() - start)
+
+    await pooled.aclose()
+    await batched.aclose()
+
+
+async def main(args: argparse.Namespace) -> None:
+    for transport in args.transports:
+        server = start_server(transport) if not args.no_server else None
+        try:
+            await benchmark_transport(transport, args.calls, args.concurrency)
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="MCP tool-call latency benchmark")
+    parser.add_argument("--calls", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument(
+        "--transports",
+        nargs="+",
+        choices=list(TRANSPORT_URLS),
+        default=list(TRANSPORT_URLS),
+    )
+    parser.add_argument(
+        "--no-server", action="store_true", help="use an already running mcp_server.py"
+    )
+    asyncio.run(main(parser.parse_args()))
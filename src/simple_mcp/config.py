@@ -8,6 +8,15 @@ class LLMConfigParams:
     MIROSTAT: int = 0
     IS_FUNCTION_CALLING_MODEL: bool = True
     MCP_SERVER_URL: str = "http://127.0.0.1:8000/sse"
+    MCP_STREAMABLE_HTTP_URL: str = "http://127.0.0.1:8000/mcp"
+    MCP_SERVER_PORT: int = 8000
+    # Pooled MCP client
+    MCP_MAX_IN_FLIGHT: int = 16
+    MCP_CONNECT_ATTEMPTS: int = 5
+    # Coalesce calls to these tools issued within MCP_BATCH_WINDOW seconds into one batch_call
+    MCP_BATCH_TOOLS: tuple = ("calculator_tool",)
+    MCP_BATCH_WINDOW: float = 0.005
+    MCP_MAX_BATCH_SIZE: int = 64
 
 
 # Create a singleton instance
@@ -1,18 +1,18 @@
 import asyncio
-from llama_index.tools.mcp import BasicMCPClient, McpToolSpec
-from llama_index.core.agent.workflow import ReActAgent, FunctionAgent
+from llama_index.tools.mcp import McpToolSpec
+from llama_index.core.agent.workflow import FunctionAgent
 from llama_index.llms.ollama import Ollama
-from llama_index.tools.mcp import (
-    get_tools_from_mcp_url,
-    aget_tools_from_mcp_url,
-)
 from llama_index.core.settings import Settings
 from config import config
+from mcp_pool import PooledMCPClient
 
 
 async def main():
-    # Connect to your MCP server
-    mcp_client = BasicMCPClient(config.MCP_SERVER_URL)
+    # Connect to your MCP server, keeping one session open for all tool calls;
+    # parallel calculator_tool calls from the agent are sent as one batch_call
+    mcp_client = PooledMCPClient(
+        config.MCP_SERVER_URL, batch_tools=config.MCP_BATCH_TOOLS
+    )
     mcp_tool_spec = McpToolSpec(client=mcp_client)
 
     tools = await mcp_tool_spec.to_tool_list_async()
@@ -28,13 +28,20 @@ async def main():
     # 4. Create an agent with the MCP tools
     agent = FunctionAgent(
         tools=tools,
-        system_prompt="You are an AI assistant for Tool Calling. You have access to the following tools: calculator_tool.",
+        allow_parallel_tool_calls=True,
+        system_prompt=(
+            "You are an AI assistant for Tool Calling. You have access to the following tools: "
+            "calculator_tool, calculator_vector_tool and batch_call. When you need several "
+            "independent operations, issue all the tool calls at once or use calculator_vector_tool."
+        ),
     )
 
     # Run a query through the agent
     response = await agent.run("How much 10 + 2?")
     print(response)
 
+    await mcp_client.aclose()
+
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -0,0 +1,244 @@
+"""
+Pooled MCP client
+
+Keeps one long-lived MCP session per server instead of opening a session per
+tool call, reconnects with exponential backoff when the connection drops and
+caches the tool list until the server version changes or the server notifies
+that its tools changed. Many tool calls can be in flight on the session at once, and calls issued
+together (such as an agent's parallel tool calls) can be coalesced into a
+single batch_call request when the server exposes one.
+
+PooledMCPClient implements list_tools() and call_tool() so it can be passed to
+McpToolSpec in place of BasicMCPClient.
+"""
+
+import asyncio
+import json
+from contextlib import AsyncExitStack
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import anyio
+import httpx
+from mcp import ClientSession, types
+from mcp.client.sse import sse_client
+from mcp.client.streamable_http import streamablehttp_client
+from tenacity import AsyncRetrying, stop_after_attempt, wait_exponential
+
+from config import config
+
+BATCH_TOOL = "batch_call"
+
+CONNECTION_ERRORS = (
+    anyio.ClosedResourceError,
+    anyio.BrokenResourceError,
+    anyio.EndOfStream,
+    ConnectionError,
+    httpx.TransportError,
+)
+
+
+class PooledMCPClient:
+    def __init__(
+        self,
+        url: str,
+        transport: Optional[str] = None,
+        max_in_flight: int = config.MCP_MAX_IN_FLIGHT,
+        connect_attempts: int = config.MCP_CONNECT_ATTEMPTS,
+        batch_tools: Iterable[str] = (),
+        batch_window: float = config.MCP_BATCH_WINDOW,
+        max_batch_size: int = config.MCP_MAX_BATCH_SIZE,
+    ):
+        self.url = url
+        # Same convention as BasicMCPClient: SSE endpoints end in /sse
+        self.transport = transport or (
+            "sse" if urlparse(url).path.endswith("/sse") else "streamable-http"
+        )
+        self.connect_attempts = connect_attempts
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+        self._connect_lock = asyncio.Lock()
+        self._session: Optional[ClientSession] = None
+        self._session_task: Optional[asyncio.Task] = None
+        self._session_closed: Optional[asyncio.Event] = None
+        self._server_version: Optional[str] = None
+        self._tools_version = 0
+        self._tools_cache: Optional[Tuple[Tuple[Optional[str], int], Any]] = None
+        # Calls to batch_tools wait up to batch_window seconds to be sent together
+        self.batch_tools = frozenset(batch_tools)
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self._pending: List[Tuple[str, Dict[str, Any], asyncio.Future]] = []
+        self._flush_tasks: set = set()
+
+    async def __aenter__(self) -> "PooledMCPClient":
+        await self._get_session()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    def _transport_client(self):
+        if self.transport == "sse":
+            return sse_client(self.url)
+        return streamablehttp_client(self.url)
+
+    async def _on_message(self, message) -> None:
+        if isinstance(message, types.ServerNotification) and isinstance(
+            message.root, types.ToolListChangedNotification
+        ):
+            self._tools_version += 1
+
+    async def _run_session(self, ready: asyncio.Future, closed: asyncio.Event) -> None:
+        # The transport's task group must be entered and exited by the same
+        # task, so a dedicated task owns the session for its whole lifetime.
+        try:
+            async with AsyncExitStack() as stack:
+                streams = await stack.enter_async_context(self._transport_client())
+                session = await stack.enter_async_context(
+                    ClientSession(
+                        streams[0], streams[1], message_handler=self._on_message
+                    )
+                )
+                result = await session.initialize()
+                self._server_version = (
+                    f"{result.serverInfo.name}/{result.serverInfo.version}"
+                )
+                ready.set_result(session)
+                await closed.wait()
+        except BaseException as e:
+            if not ready.done():
+                ready.set_exception(e)
+            if not isinstance(e, Exception):
+                raise
+
+    async def _connect(self) -> ClientSession:
+        ready = asyncio.get_running_loop().create_future()
+        closed = asyncio.Event()
+        task = asyncio.create_task(self._run_session(ready, closed))
+        try:
+            session = await ready
+        except BaseException:
+            closed.set()
+            await asyncio.gather(task, return_exceptions=True)
+            raise
+        self._session, self._session_task, self._session_closed = session, task, closed
+        return session
+
+    async def _get_session(self) -> ClientSession:
+        if self._session is not None:
+            return self._session
+        async with self._connect_lock:
+            if self._session is not None:
+                return self._session
+            async for attempt in AsyncRetrying(
+                stop=stop_after_attempt(self.connect_attempts),
+                wait=wait_exponential(multiplier=0.5, min=0.5, max=10),
+                reraise=True,
+            ):
+                with attempt:
+                    return await self._connect()
+
+    async def _reset(self, session: ClientSession) -> None:
+        """Tear down a broken session unless another caller already replaced it."""
+        async with self._connect_lock:
+            if self._session is not session:
+                return
+            self._session = None
+            self._session_closed.set()
+            await asyncio.gather(self._session_task, return_exceptions=True)
+
+    async def aclose(self) -> None:
+        if self._session is not None:
+            await self._reset(self._session)
+
+    async def _request(self, method: str, *args, **kwargs):
+        for attempt in range(2):
+            session = await self._get_session()
+            try:
+                async with self._in_flight:
+                    return await getattr(session, method)(*args, **kwargs)
+            except CONNECTION_ERRORS:
+                await self._reset(session)
+                if attempt:
+                    raise
+
+    async def list_tools(self) -> types.ListToolsResult:
+        """List server tools, served from cache until the tool version changes."""
+        await self._get_session()
+        version = (self._server_version, self._tools_version)
+        if self._tools_cache is None or self._tools_cache[0] != version:
+            tools = await self._request("list_tools")
+            # Re-read the version: a reconnect during the request may have changed it
+            self._tools_cache = ((self._server_version, self._tools_version), tools)
+        return self._tools_cache[1]
+
+    async def call_tool(
+        self, tool_name: str, arguments: Optional[Dict[str, Any]] = None, **kwargs
+    ) -> types.CallToolResult:
+        if (
+            tool_name not in self.batch_tools
+            or self.batch_window <= 0
+            or kwargs
+            or not await self._supports_batch()
+        ):
+            return await self._request(
+                "call_tool", tool_name, arguments or {}, **kwargs
+            )
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((tool_name, arguments or {}, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._schedule_flush()
+        elif len(self._pending) == 1:
+            loop.call_later(self.batch_window, self._schedule_flush)
+        return await future
+
+    async def _supports_batch(self) -> bool:
+        tools = await self.list_tools()
+        return any(tool.name == BATCH_TOOL for tool in tools.tools)
+
+    def _schedule_flush(self) -> None:
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        task = asyncio.create_task(self._flush(pending))
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def _flush(
+        self, pending: List[Tuple[str, Dict[str, Any], asyncio.Future]]
+    ) -> None:
+        try:
+            if len(pending) == 1:
+                tool_name, arguments, future = pending[0]
+                result = await self._request("call_tool", tool_name, arguments)
+                if not future.done():
+                    future.set_result(result)
+                return
+
+            response = await self._request(
+                "call_tool",
+                BATCH_TOOL,
+                {"calls": [{"tool": t, "arguments": a} for t, a, _ in pending]},
+            )
+            if response.isError:
+                raise RuntimeError(response.content[0].text)
+            results = json.loads(response.content[0].text)["results"]
+            for (_, _, future), result in zip(pending, results):
+                if not future.done():
+                    future.set_result(_to_call_result(result))
+        except Exception as e:
+            for _, _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+
+
+def _to_call_result(result: Dict[str, Any]) -> types.CallToolResult:
+    """Convert one batch_call entry to the result of an individual tool call."""
+    is_error = "error" in result
+    value = result["error"] if is_error else result.get("result")
+    text = value if isinstance(value, str) else json.dumps(value)
+    return types.CallToolResult(
+        content=[types.TextContent(type="text", text=text)], isError=is_error
+    )
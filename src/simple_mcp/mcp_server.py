@@ -1,11 +1,49 @@
+from typing import Any, Dict, List
 from fastmcp import FastMCP
+from pydantic import ConfigDict, ValidationError, create_model
+import numpy as np
 import asyncio
-import json
+import inspect
+import sys
+from config import config
 
-mcp = FastMCP("simple-mcp-server", port=8000)
+mcp = FastMCP("simple-mcp-server", port=config.MCP_SERVER_PORT)
+
+# Plain implementations of the tools that batch_call can dispatch to, the
+# models validating their arguments, and their vectorized counterparts taking
+# one list per argument
+BATCHABLE_TOOLS = {}
+ARGUMENT_MODELS = {}
+VECTORIZED_TOOLS = {}
+
+
+def argument_model(fn):
+    """Pydantic model of a tool's arguments, coercing like a direct tool call and rejecting unknown keys."""
+    fields = {
+        name: (param.annotation, ... if param.default is param.empty else param.default)
+        for name, param in inspect.signature(fn).parameters.items()
+    }
+    return create_model(
+        f"{fn.__name__}_arguments", __config__=ConfigDict(extra="forbid"), **fields
+    )
+
+
+def batchable(fn):
+    BATCHABLE_TOOLS[fn.__name__] = fn
+    ARGUMENT_MODELS[fn.__name__] = argument_model(fn)
+    return fn
+
+
+def vectorizes(tool_name: str):
+    def register(fn):
+        VECTORIZED_TOOLS[tool_name] = fn
+        return fn
+
+    return register
 
 
 @mcp.tool()
+@batchable
 async def calculator_tool(a: int, b: int) -> int:
     """Adds two integers and returns their sum.
 
@@ -19,5 +57,93 @@ async def calculator_tool(a: int, b: int) -> int:
     return a + b
 
 
+@mcp.tool()
+@vectorizes("calculator_tool")
+async def calculator_vector_tool(a: List[int], b: List[int]) -> List[int]:
+    """Adds two lists of integers element-wise and returns the list of sums.
+
+    Args:
+        a (List[int]): First integers to add
+        b (List[int]): Second integers to add, same length as a
+
+    Returns:
+        List[int]: The element-wise sums of a and b
+    """
+    if len(a) != len(b):
+        raise ValueError(
+            f"a and b must have the same length, got {len(a)} and {len(b)}"
+        )
+    return (np.asarray(a, dtype=np.int64) + np.asarray(b, dtype=np.int64)).tolist()
+
+
+async def _run_group(tool_name: str, arguments: List[Dict[str, Any]]) -> List[Dict]:
+    """Run all calls of one tool, using its vectorized form when there is one."""
+    if tool_name not in BATCHABLE_TOOLS:
+        return [{"error": f"Unknown or non-batchable tool: {tool_name}"}] * len(
+            arguments
+        )
+
+    # Validate every call first, so the scalar and vectorized paths see the
+    # same coerced arguments and invalid calls fail as they would individually
+    results: List[Dict[str, Any]] = [{}] * len(arguments)
+    valid: Dict[int, Dict[str, Any]] = {}
+    for i, args in enumerate(arguments):
+        try:
+            valid[i] = dict(ARGUMENT_MODELS[tool_name].model_validate(args))
+        except ValidationError as e:
+            results[i] = {"error": str(e)}
+
+    vectorized = VECTORIZED_TOOLS.get(tool_name)
+    if vectorized is not None and len(valid) > 1:
+        try:
+            columns = {
+                name: [args[name] for args in valid.values()]
+                for name in next(iter(valid.values()))
+            }
+            for i, r in zip(valid, await vectorized(**columns)):
+                results[i] = {"result": r}
+            return results
+        except Exception:
+            # Fall back to per-call execution to report errors per call
+            pass
+
+    outcomes = await asyncio.gather(
+        *(BATCHABLE_TOOLS[tool_name](**args) for args in valid.values()),
+        return_exceptions=True,
+    )
+    for i, r in zip(valid, outcomes):
+        results[i] = {"error": str(r)} if isinstance(r, Exception) else {"result": r}
+    return results
+
+
+@mcp.tool()
+async def batch_call(calls: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """Invokes several tool calls in one request.
+
+    Args:
+        calls (List[Dict]): Tool calls, each {"tool": <tool name>, "arguments": {...}}
+
+    Returns:
+        Dict: {"results": [...]} with one {"result": ...} or {"error": ...} per call, in order
+    """
+    groups: Dict[str, List[int]] = {}
+    for i, call in enumerate(calls):
+        groups.setdefault(call.get("tool", ""), []).append(i)
+
+    results: List[Dict[str, Any]] = [{}] * len(calls)
+    group_results = await asyncio.gather(
+        *(
+            _run_group(tool_name, [calls[i].get("arguments", {}) for i in indices])
+            for tool_name, indices in groups.items()
+        )
+    )
+    for indices, group in zip(groups.values(), group_results):
+        for i, result in zip(indices, group):
+            results[i] = result
+    return {"results": results}
+
+
 if __name__ == "__main__":
-    mcp.run(transport="sse", port=8000)
+    # Usage: python mcp_server.py [sse|streamable-http]
+    transport = sys.argv[1] if len(sys.argv) > 1 else "sse"
+    mcp.run(transport=transport, port=config.MCP_SERVER_PORT)
@@ -1,23 +1,58 @@
 from llama_index.core import Settings
-from llama_index.llms.ollama import Ollama
 from llama_index.core.agent.workflow import (
     AgentWorkflow,
     AgentOutput,
     ToolCall,
     ToolCallResult,
 )
-from llama_index.tools.tavily_research.base import TavilyToolSpec
-from llama_index.core.workflow import Context
+from llama_index.core.instrumentation import get_dispatcher
+from llama_index.core.instrumentation.event_handlers import BaseEventHandler
+from llama_index.core.instrumentation.events.llm import (
+    LLMChatEndEvent,
+    LLMCompletionEndEvent,
+)
+from llama_index.core.workflow import WorkflowTimeoutError
+from pydantic import PrivateAttr
 import asyncio
 from config import config
 from agents.research_planner import create_research_planner
 from agents.web_researcher import create_web_researcher
 from agents.report_writer import create_report_writer
 from agents.quality_reviewer import create_quality_reviewer
-from llama_index.core.workflow import JsonPickleSerializer, JsonSerializer
+from budget import RunBudget, is_true
+
+# Lets the graceful budget stop run before the workflow's own timeout fires
+TIMEOUT_GRACE_SECONDS = 60
+
+
+class BudgetEventHandler(BaseEventHandler):
+    """Records every LLM call against the run budget.
+
+    Covers the agents as well as the calls made inside tools, such as the
+    research fan-out summaries and note summaries, which emit no AgentOutput.
+    """
+
+    _budget: RunBudget = PrivateAttr()
+
+    def __init__(self, budget: RunBudget, **kwargs):
+        super().__init__(**kwargs)
+        self._budget = budget
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "BudgetEventHandler"
+
+    def handle(self, event, **kwargs) -> None:
+        if isinstance(event, LLMChatEndEvent) and event.response is not None:
+            response = event.response
+            self._budget.record_llm_call(response.raw, response.message.content or "")
+        elif isinstance(event, LLMCompletionEndEvent):
+            self._budget.record_llm_call(event.response.raw, event.response.text)
 
 
 async def main():
+    from llama_index.llms.ollama import Ollama
+
     Settings.llm = Ollama(
         model=config.DEFAULT_MODEL,
         timeout=300,
@@ -33,14 +68,24 @@ async def main():
     quality_reviewer = create_quality_reviewer()
 
     # Create workflow
+    budget = RunBudget()
+    get_dispatcher().add_event_handler(BudgetEventHandler(budget))
     workflow = AgentWorkflow(
         agents=[research_planner, web_researcher, report_writer, quality_reviewer],
         root_agent=research_planner.name,
         initial_state={
-            "research_notes": {},
+            "research_notes": [],
+            "report_outline": "",
+            "search_queries": [],
             "report_content": "Not written yet.",
             "review": "Review required.",
+            "approved": False,
         },
+        timeout=(
+            budget.max_wall_time + TIMEOUT_GRACE_SECONDS
+            if budget.max_wall_time is not None
+            else None
+        ),
     )
 
     # Run workflow
@@ -50,32 +95,53 @@ async def main():
 
     # Stream progress
     current_agent = None
-    async for event in handler.stream_events():
-        if (
-            hasattr(event, "current_agent_name")
-            and event.current_agent_name != current_agent
-        ):
-            current_agent = event.current_agent_name
-            print(f"\n{'='*50}")
-            print(f"Agent: {current_agent}")
-            print(f"{'='*50}\n")
-        elif isinstance(event, AgentOutput):
-            if event.response.content:
-                print("Output:", event.response.content)
-            if event.tool_calls:
-                print(
-                    "Planning to use tools:",
-                    [call.tool_name for call in event.tool_calls],
-                )
-        elif isinstance(event, ToolCallResult):
-            print(f"Tool Result ({event.tool_name}):")
-            print(f"  Arguments: {event.tool_kwargs}")
-            print(f"  Output: {event.tool_output}")
-        elif isinstance(event, ToolCall):
-            print(f"Calling Tool: {event.tool_name}")
-            print(f"  With arguments: {event.tool_kwargs}")
-
-    print(workflow.initial_state)
+    stop_reason = None
+    try:
+        async for event in handler.stream_events():
+            if (
+                hasattr(event, "current_agent_name")
+                and event.current_agent_name != current_agent
+            ):
+                if current_agent is not None:
+                    budget.record_handoff()
+                current_agent = event.current_agent_name
+                print(f"\n{'='*50}")
+                print(f"Agent: {current_agent}")
+                print(f"{'='*50}\n")
+            if isinstance(event, AgentOutput):
+                if event.response.content:
+                    print("Output:", event.response.content)
+                if event.tool_calls:
+                    print(
+                        "Planning to use tools:",
+                        [call.tool_name for call in event.tool_calls],
+                    )
+            elif isinstance(event, ToolCallResult):
+                print(f"Tool Result ({event.tool_name}):")
+                print(f"  Arguments: {event.tool_kwargs}")
+                print(f"  Output: {event.tool_output}")
+                if event.tool_name == "review_report" and is_true(
+                    event.tool_kwargs.get("approved")
+                ):
+                    stop_reason = "approved"
+            elif isinstance(event, ToolCall):
+                print(f"Calling Tool: {event.tool_name}")
+                print(f"  With arguments: {event.tool_kwargs}")
+
+            stop_reason = stop_reason or budget.exceeded()
+            if stop_reason is not None:
+                # The report is already in the workflow state, so stop the run
+                # instead of letting the agents keep handing off to each other.
+                await handler.cancel_run()
+                break
+        else:
+            await handler
+    except WorkflowTimeoutError:
+        stop_reason = "wall_time"
+
+    print(f"\nRun finished ({stop_reason or 'completed'}): {budget.report()}")
+    state = await handler.ctx.get("state")
+    print(state["report_content"])
 
 
 if __name__ == "__main__":
@@ -2,12 +2,13 @@ from llama_index.core.agent.workflow import FunctionAgent
 from llama_index.core.workflow import Context
 
 
-async def review_report(ctx: Context, review: str) -> str:
-    """Useful for reviewing a report and providing feedback."""
+async def review_report(ctx: Context, review: str, approved: bool) -> str:
+    """Useful for reviewing a report and providing feedback. Set approved to true only if the report needs no changes."""
     current_state = await ctx.get("state")
     current_state["review"] = review
+    current_state["approved"] = approved
     await ctx.set("state", current_state)
-    return "Report reviewed."
+    return "Report approved." if approved else "Report reviewed."
 
 
 def create_quality_reviewer() -> FunctionAgent:
@@ -16,8 +17,9 @@ def create_quality_reviewer() -> FunctionAgent:
         description="Useful for reviewing a report and providing feedback.",
         system_prompt=(
             "You are the ReviewAgent that can review a report and provide feedback."
-            "Your feedback should either approve the current report or request changes for the WriteAgent to implement."
+            "Your feedback should either approve the current report or request changes for the WriteAgent to implement. "
+            "Always record your verdict with the review_report tool."
         ),
         tools=[review_report],
-        can_handoff_to=["WriteAgent"],
+        can_handoff_to=["ReportWriter"],
     )
@@ -1,5 +1,8 @@
+from llama_index.core import Settings
 from llama_index.core.agent.workflow import FunctionAgent
 from llama_index.core.workflow import Context
+from config import config
+from notes import NotesPacker, truncate_tokens
 
 
 async def write_report(ctx: Context, report_content: str) -> str:
@@ -10,15 +13,38 @@ async def write_report(ctx: Context, report_content: str) -> str:
     return "Report written."
 
 
+async def summarize_note(title: str, notes: str) -> str:
+    """Compress a research note that does not fit the notes budget."""
+    # Notes reaching this path are the ones too large for the budget, so they
+    # are cut to what fits the model context alongside the prompt
+    notes = truncate_tokens(notes, config.NOTES_SUMMARY_INPUT_TOKENS)
+    response = await Settings.llm.acomplete(
+        f"Summarize the key facts of these research notes on '{title}' in a few "
+        f"sentences. Return only the summary.\n\n{notes}"
+    )
+    return str(response).strip()
+
+
 def create_report_writer() -> FunctionAgent:
+    packer = NotesPacker(summarize=summarize_note)
+
+    async def read_research_notes(ctx: Context) -> str:
+        """Useful for reading the most relevant research notes for the report outline."""
+        current_state = await ctx.get("state")
+        return await packer.pack(
+            await ctx.get("research_notes", default={}),
+            current_state.get("report_outline", ""),
+        )
+
     return FunctionAgent(
         name="ReportWriter",
         description="Useful for writing a report on a given topic.",
         system_prompt=(
             "You are the WriteAgent that can write a report on a given topic. "
-            "Your report should be in a markdown format. The content should be grounded in the research notes. "
+            "Your report should be in a markdown format. The content should be grounded in the research notes, "
+            "which you can read with the read_research_notes tool. "
             "Once the report is written, you should get feedback at least once from the QualityReviewer."
         ),
-        tools=[write_report],
+        tools=[read_research_notes, write_report],
         can_handoff_to=["QualityReviewer", "WebResearcher"],
     )
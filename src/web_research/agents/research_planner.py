@@ -1,4 +1,22 @@
+from typing import List
 from llama_index.core.agent.workflow import FunctionAgent
+from llama_index.core.workflow import Context
+
+
+async def record_outline(ctx: Context, outline: str) -> str:
+    """Useful for recording the report outline so research notes can be ranked against it."""
+    current_state = await ctx.get("state")
+    current_state["report_outline"] = outline
+    await ctx.set("state", current_state)
+    return "Outline recorded."
+
+
+async def record_search_queries(ctx: Context, queries: List[str]) -> str:
+    """Useful for recording the full list of web search queries for the WebResearcher."""
+    current_state = await ctx.get("state")
+    current_state["search_queries"] = queries
+    await ctx.set("state", current_state)
+    return f"Recorded {len(queries)} search queries."
 
 
 def create_research_planner() -> FunctionAgent:
@@ -7,8 +25,8 @@ def create_research_planner() -> FunctionAgent:
         description="Creates search strategies and report outlines",
         system_prompt="""You are an expert research planner for any given topic. You understand the topic and:
         1. Identify key subtopics (political, personal, economic)
-        2. Generate 5 search queries per subtopic
-        3. Create report outline with sections. You then hand off the control to the WebResearcher to search the web for information on the topic.""",
-        tools=[],
+        2. Generate 5 search queries per subtopic and record all of them in one call to the record_search_queries tool
+        3. Create report outline with sections and record it with the record_outline tool. You then hand off the control to the WebResearcher to search the web for information on the topic.""",
+        tools=[record_outline, record_search_queries],
         can_handoff_to=["WebResearcher"],
     )
@@ -1,28 +1,64 @@
 from llama_index.core.agent.workflow import FunctionAgent
-from llama_index.tools.tavily_research.base import TavilyToolSpec
 from llama_index.core.workflow import Context
+from config import config
+from research import fan_out_research
 import os
 
 
 async def record_notes(ctx: Context, notes: str, notes_title: str) -> str:
     """Useful for recording notes on a given topic."""
+    # Raw notes are kept out of the shared state, which is injected into every
+    # agent prompt; the ReportWriter reads a budgeted subset via read_research_notes.
+    research_notes = await ctx.get("research_notes", default={})
+    research_notes[notes_title] = notes
+    await ctx.set("research_notes", research_notes)
+
     current_state = await ctx.get("state")
     if "research_notes" not in current_state:
-        current_state["research_notes"] = {}
-    current_state["research_notes"][notes_title] = notes
+        current_state["research_notes"] = []
+    if notes_title not in current_state["research_notes"]:
+        current_state["research_notes"].append(notes_title)
     await ctx.set("state", current_state)
     return "Notes recorded."
 
 
-def create_web_researcher() -> FunctionAgent:
+async def research_planned_queries(ctx: Context) -> str:
+    """Useful for searching the web for all planned search queries at once and recording notes for each."""
+    current_state = await ctx.get("state")
+    queries = current_state.get("search_queries", [])
+    if not queries:
+        return "No search queries were planned. Use search and record_notes instead."
+
+    notes, failures = await fan_out_research(queries)
+    for query, query_notes in notes.items():
+        await record_notes(ctx, query_notes, query)
+
+    message = f"Recorded notes for {len(notes)} search queries."
+    if failures:
+        failed = "\n".join(f"- {query}: {reason}" for query, reason in failures.items())
+        message += f"\nNo notes recorded for these queries, search them individually if needed:\n{failed}"
+    return message
+
+
+def create_web_researcher(parallel: bool = config.PARALLEL_RESEARCH) -> FunctionAgent:
+    from llama_index.tools.tavily_research.base import TavilyToolSpec
+
+    tools = [
+        TavilyToolSpec(api_key=os.environ.get("TAVILY_API_KEY")).to_tool_list()[0],
+        record_notes,
+    ]
+    system_prompt = """You are the ResearchAgent that can search the web for information on a given topic and record notes on the topic.
+        Once notes are recorded and you are satisfied, you should hand off control to the ReportWriter to write a report on the topic."""
+    if parallel:
+        tools.insert(0, research_planned_queries)
+        system_prompt += """
+        Start by calling research_planned_queries once to research every planned query in parallel.
+        Only use individual searches to fill gaps the planned queries did not cover."""
+
     return FunctionAgent(
         name="WebResearcher",
         description="Useful for searching the web for information on a given topic and recording notes on the topic.",
-        system_prompt="""You are the ResearchAgent that can search the web for information on a given topic and record notes on the topic.
-        Once notes are recorded and you are satisfied, you should hand off control to the ReportWriter to write a report on the topic.""",
-        tools=[
-            TavilyToolSpec(api_key=os.environ.get("TAVILY_API_KEY")).to_tool_list()[0],
-            record_notes,
-        ],
+        system_prompt=system_prompt,
+        tools=tools,
         can_handoff_to=["ReportWriter"],
     )
@@ -4,6 +4,26 @@ from dataclasses import dataclass
 @dataclass
 class LLMConfigParams:
     DEFAULT_MODEL: str = "qwen2.5:14b-instruct-q4_K_M"
+    # Research notes packing for the ReportWriter (context_window is 4096)
+    TOKENIZER_ENCODING: str = "cl100k_base"
+    NOTES_TOKEN_BUDGET: int = 2048
+    NOTES_CHUNK_TOKENS: int = 256
+    NOTES_SUMMARY_TOKENS: int = 160
+    # Note text sent for summarization; leaves room for the prompt, the summary
+    # and tokenizer differences between tiktoken and the model
+    NOTES_SUMMARY_INPUT_TOKENS: int = 3072
+    NOTES_DEDUP_THRESHOLD: float = 0.8
+    # Run the planner's search queries concurrently in a single tool call
+    PARALLEL_RESEARCH: bool = True
+    MAX_CONCURRENT_SEARCHES: int = 8
+    MAX_CONCURRENT_SUMMARIES: int = 2
+    SEARCH_MAX_RESULTS: int = 5
+    # Run budget per workflow run (None disables a limit)
+    MAX_HANDOFFS: int = 8
+    # Counts every LLM call, including research fan-out and note summaries
+    MAX_LLM_CALLS: int = 80
+    MAX_TOKENS: int = 200_000
+    MAX_WALL_TIME_SECONDS: float = 1800
 
 
 # Create a singleton instance
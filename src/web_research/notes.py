@@ -0,0 +1,209 @@
+"""
+Research Notes Pipeline
+
+Chunks, deduplicates and ranks the raw notes recorded by the WebResearcher,
+then packs the most relevant subset into a fixed token budget so the
+ReportWriter never overflows the model context window.
+"""
+
+import hashlib
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from config import config
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the "
+    "their this to was were will with".split()
+)
+
+
+@lru_cache(maxsize=None)
+def get_tokenizer(encoding_name: str = config.TOKENIZER_ENCODING):
+    """Load a tiktoken encoding once per process."""
+    import tiktoken
+
+    return tiktoken.get_encoding(encoding_name)
+
+
+def count_tokens(text: str) -> int:
+    """Count tokens in text using the cached local tokenizer."""
+    return len(get_tokenizer().encode(text, disallowed_special=()))
+
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    """Truncate text to at most max_tokens tokens."""
+    tokenizer = get_tokenizer()
+    tokens = tokenizer.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    return tokenizer.decode(tokens[:max_tokens])
+
+
+def tokenize_words(text: str) -> List[str]:
+    """Lowercase word terms used for ranking and deduplication."""
+    return [w for w in _WORD_RE.findall(text.lower()) if w not in _STOPWORDS]
+
+
+@dataclass
+class NoteChunk:
+    """A token-bounded slice of a single research note."""
+
+    title: str
+    text: str
+    tokens: int
+    score: float = 0.0
+
+
+class NotesPacker:
+    """Packs research notes into a token budget ranked by relevance to an outline."""
+
+    def __init__(
+        self,
+        token_budget: int = config.NOTES_TOKEN_BUDGET,
+        chunk_tokens: int = config.NOTES_CHUNK_TOKENS,
+        summary_tokens: int = config.NOTES_SUMMARY_TOKENS,
+        dedup_threshold: float = config.NOTES_DEDUP_THRESHOLD,
+        summarize: Optional[Callable[[str, str], Awaitable[str]]] = None,
+    ):
+        self.token_budget = token_budget
+        self.chunk_tokens = chunk_tokens
+        self.summary_tokens = summary_tokens
+        self.dedup_threshold = dedup_threshold
+        self.summarize = summarize
+        self._summary_cache: Dict[str, str] = {}
+
+    def chunk(self, notes: Dict[str, str]) -> List[NoteChunk]:
+        """Split each note into paragraph-aligned chunks of at most chunk_tokens."""
+        chunks = []
+        for title, text in notes.items():
+            buffer, buffer_tokens = [], 0
+            for paragraph in (p.strip() for p in str(text).split("\n\n")):
+                if not paragraph:
+                    continue
+                paragraph_tokens = count_tokens(paragraph)
+                if paragraph_tokens > self.chunk_tokens:
+                    if buffer:
+                        chunks.append(
+                            NoteChunk(title, "\n\n".join(buffer), buffer_tokens)
+                        )
+                        buffer, buffer_tokens = [], 0
+                    chunks.extend(self._split_paragraph(title, paragraph))
+                    continue
+                if buffer_tokens + paragraph_tokens > self.chunk_tokens:
+                    chunks.append(NoteChunk(title, "\n\n".join(buffer), buffer_tokens))
+                    buffer, buffer_tokens = [], 0
+                buffer.append(paragraph)
+                buffer_tokens += paragraph_tokens
+            if buffer:
+                chunks.append(NoteChunk(title, "\n\n".join(buffer), buffer_tokens))
+        return chunks
+
+    def _split_paragraph(self, title: str, paragraph: str) -> List[NoteChunk]:
+        tokenizer = get_tokenizer()
+        tokens = tokenizer.encode(paragraph, disallowed_special=())
+        return [
+            NoteChunk(
+                title,
+                tokenizer.decode(tokens[i : i + self.chunk_tokens]),
+                len(tokens[i : i + self.chunk_tokens]),
+            )
+            for i in range(0, len(tokens), self.chunk_tokens)
+        ]
+
+    def deduplicate(self, chunks: List[NoteChunk]) -> List[NoteChunk]:
+        """Drop exact and near-duplicate chunks, keeping the first occurrence."""
+        seen_hashes = set()
+        kept, kept_shingles = [], []
+        for chunk in chunks:
+            words = tokenize_words(chunk.text)
+            digest = hashlib.sha1(" ".join(words).encode()).hexdigest()
+            if digest in seen_hashes:
+                continue
+            shingles = {tuple(words[i : i + 3]) for i in range(max(len(words) - 2, 1))}
+            if any(
+                len(shingles & other) / len(shingles | other) >= self.dedup_threshold
+                for other in kept_shingles
+                if shingles and other
+            ):
+                continue
+            seen_hashes.add(digest)
+            kept.append(chunk)
+            kept_shingles.append(shingles)
+        return kept
+
+    def rank(self, chunks: List[NoteChunk], outline: str) -> List[NoteChunk]:
+        """Score chunks with BM25 against the report outline, best first."""
+        query_terms = set(tokenize_words(outline))
+        if not query_terms or not chunks:
+            return list(chunks)
+
+        chunk_terms = [Counter(tokenize_words(c.text)) for c in chunks]
+        avg_len = sum(sum(t.values()) for t in chunk_terms) / len(chunks) or 1.0
+        doc_freq = Counter(term for terms in chunk_terms for term in terms)
+        k1, b = 1.5, 0.75
+
+        for chunk, terms in zip(chunks, chunk_terms):
+            length = sum(terms.values())
+            score = 0.0
+            for term in query_terms & terms.keys():
+                idf = math.log(
+                    1 + (len(chunks) - doc_freq[term] + 0.5) / (doc_freq[term] + 0.5)
+                )
+                tf = terms[term]
+                score += (
+                    idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * length / avg_len))
+                )
+            chunk.score = score
+        return sorted(chunks, key=lambda c: c.score, reverse=True)
+
+    async def _summary_for(self, title: str, text: str) -> Optional[str]:
+        if self.summarize is None:
+            return None
+        key = hashlib.sha1(f"{title}\n{text}".encode()).hexdigest()
+        if key not in self._summary_cache:
+            summary = await self.summarize(title, text)
+            self._summary_cache[key] = truncate_tokens(summary, self.summary_tokens)
+        return self._summary_cache[key]
+
+    async def pack(self, notes: Dict[str, str], outline: str = "") -> str:
+        """Return the best notes that fit the token budget, grouped by note title.
+
+        Chunks that do not fit are replaced by a cached compressed summary of
+        their note when one fits in the remaining budget.
+        """
+        ranked = self.rank(self.deduplicate(self.chunk(notes)), outline)
+
+        selected: Dict[str, List[str]] = {}
+        overflow: List[str] = []
+        used = 0
+        for chunk in ranked:
+            # Account for the "## title" header the first time a note is used
+            header = 0 if chunk.title in selected else count_tokens(chunk.title) + 2
+            if used + header + chunk.tokens <= self.token_budget:
+                selected.setdefault(chunk.title, []).append(chunk.text)
+                used += header + chunk.tokens
+            elif chunk.title not in selected and chunk.title not in overflow:
+                overflow.append(chunk.title)
+
+        for title in overflow:
+            if title in selected:
+                continue
+            if self.token_budget - used < self.summary_tokens // 4:
+                break
+            summary = await self._summary_for(title, str(notes[title]))
+            if summary is None:
+                break
+            cost = count_tokens(title) + 2 + count_tokens(summary)
+            if used + cost <= self.token_budget:
+                selected[title] = [summary]
+                used += cost
+
+        return "\n\n".join(
+            f"## {title}\n" + "\n\n".join(texts) for title, texts in selected.items()
+        )
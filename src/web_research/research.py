@@ -0,0 +1,84 @@
+"""
+Parallel Research Fan-out
+
+Executes the search queries recorded by the ResearchPlanner as concurrent
+Tavily searches and summarizes the results in parallel, so the WebResearcher
+covers the whole search plan in a single tool call instead of one LLM turn
+per query.
+"""
+
+import asyncio
+import os
+from typing import Dict, List, Tuple
+
+from llama_index.core import Settings
+from tenacity import retry, stop_after_attempt, wait_exponential
+
+from config import config
+
+
+@retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(multiplier=1, min=1, max=10),
+    reraise=True,
+)
+async def search_web(client, query: str) -> List[Dict]:
+    """Search the web with Tavily and return the raw result entries."""
+    response = await client.search(query, max_results=config.SEARCH_MAX_RESULTS)
+    return response.get("results", [])
+
+
+async def summarize_results(query: str, results: List[Dict]) -> str:
+    """Condense search results for one query into research notes with sources."""
+    sources = "\n\n".join(
+        f"[{i}] {r.get('title', '')} ({r.get('url', '')})\n{r.get('content', '')}"
+        for i, r in enumerate(results, start=1)
+    )
+    response = await Settings.llm.acomplete(
+        f"Write concise research notes answering the search query '{query}' "
+        f"using only the sources below. Cite sources as [n]. Return only the notes.\n\n"
+        f"{sources}"
+    )
+    urls = "\n".join(f"[{i}] {r.get('url', '')}" for i, r in enumerate(results, 1))
+    return f"{str(response).strip()}\n\nSources:\n{urls}"
+
+
+async def fan_out_research(
+    queries: List[str],
+    max_searches: int = config.MAX_CONCURRENT_SEARCHES,
+    max_summaries: int = config.MAX_CONCURRENT_SUMMARIES,
+) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """Run all queries concurrently.
+
+    Searches and LLM summaries are bounded by separate semaphores because the
+    web API and the local model server have very different capacity. A failed
+    query does not affect the others: returns research notes keyed by query
+    and, separately, the failure reason for each query that produced none.
+    """
+    from tavily import AsyncTavilyClient
+
+    client = AsyncTavilyClient(api_key=os.environ.get("TAVILY_API_KEY"))
+    search_slots = asyncio.Semaphore(max_searches)
+    summary_slots = asyncio.Semaphore(max_summaries)
+
+    async def research(query: str) -> str:
+        async with search_slots:
+            results = await search_web(client, query)
+        if not results:
+            raise LookupError("no search results")
+        async with summary_slots:
+            return await summarize_results(query, results)
+
+    unique_queries = list(dict.fromkeys(q.strip() for q in queries if q.strip()))
+    outcomes = await asyncio.gather(
+        *(research(q) for q in unique_queries), return_exceptions=True
+    )
+
+    notes, failures = {}, {}
+    for query, outcome in zip(unique_queries, outcomes):
+        if isinstance(outcome, Exception):
+            print(f"Research failed for '{query}': {str(outcome)}")
+            failures[query] = str(outcome) or type(outcome).__name__
+        else:
+            notes[query] = outcome
+    return notes, failures